@@ -0,0 +1,159 @@
+import json
+import platform
+from argparse import ArgumentParser
+from io import StringIO
+from math import pi
+from time import perf_counter
+
+import numpy as np
+
+from geometria import cubo, tetraedro, malha_sintetica, projecao_da_cena
+from rasterizacao import (SUBCELULAS, coordenadas_continuas_dos_segmentos, eixo_da_projecao, grade_de_impressao,
+                          quadro_de_ocupacao, recortar_segmentos, string_da_cena, string_da_cena_em_subcelulas,
+                          string_do_quadro)
+from malhas import carregar_malha
+from perfil import ETAPAS, Perfil
+from terminal import Tela, centralize_lines
+
+# Modos de impressão medidos com a rasterização DDA:
+MODOS = ("ascii", "profundidade") + tuple(SUBCELULAS)
+
+
+def cenas_de_referencia(arestas_sinteticas, modelos=()):
+    """Retorna as cenas medidas: o cubo, o tetraedro, uma esfera sintética para cada quantidade de arestas dada e os
+    modelos 3D lidos dos caminhos dados."""
+    return [cubo(), tetraedro()] + [malha_sintetica(n) for n in arestas_sinteticas] + [carregar_malha(m) for m in modelos]
+
+
+def rotacoes_de_teste(cena, quantidade, passo=0.025):
+    """Retorna uma sequência de pares (Rotacao_1, Rotacao_2) que orbita a cena a partir da sua rotação inicial,
+    avançando em passos iguais aos das teclas W/A/S/D."""
+    return [(cena["rotacao_1"] + n * passo, cena["rotacao_2"] + n * passo / 2) for n in range(quantidade)]
+
+
+def cena_ampliada(cena, escala):
+    """Retorna uma cópia da cena com as coordenadas e os limites do plano de projeção multiplicados por 'escala', o que
+    aumenta a grade de impressão na mesma proporção."""
+    if escala == 1:
+        return cena
+    chave = "vertices" if "arestas" in cena else "segmentos"
+    return dict(cena, **{chave: cena[chave] * escala, "limites": tuple(limite * escala for limite in cena["limites"])})
+
+
+def string_com_amostragem_fixa(cena, rotacao_1, rotacao_2, quantidade, perfil, zoom=1, deslocamento=(0, 0)):
+    """Versão de 'string_da_cena' que amostra 'quantidade' pontos por segmento, em vez de um ponto por célula, mantida
+    apenas para comparar as duas amostragens."""
+    inicio = perf_counter()
+    extremidades = projecao_da_cena(cena, pi * rotacao_1, pi * rotacao_2)
+    if zoom != 1 or any(deslocamento):
+        extremidades = (extremidades - deslocamento) * zoom
+    projetado = perf_counter()
+    colunas, linhas = grade_de_impressao(*cena["limites"])
+    visiveis = recortar_segmentos(extremidades, colunas[0] - .5, colunas[-1] + .5, linhas[-1] - .5, linhas[0] + .5)
+    recortado = perf_counter()
+    coordenadas = coordenadas_continuas_dos_segmentos(visiveis, quantidade)
+    amostrado = perf_counter()
+    quadro = quadro_de_ocupacao(colunas, linhas, coordenadas)
+    rasterizado = perf_counter()
+    string_total = string_do_quadro(colunas, linhas, quadro, "*", eixo_da_projecao(zoom, deslocamento))
+    perfil.registrar_sequencia((inicio, projetado, recortado, amostrado, rasterizado, perf_counter()))
+    perfil.contar(segmentos=len(extremidades), visiveis=len(visiveis), pontos=len(coordenadas))
+    return string_total
+
+
+def medir_quadros(cena, rotacoes, quantidade=None, escala=1, zoom=1, deslocamento=(0, 0), modo="ascii"):
+    """Renderiza, sem terminal, um quadro da cena para cada par de rotações, com as funções do programa no 'modo'
+    dado ou, com uma 'quantidade' fixa de pontos por segmento, com a amostragem fixa, e retorna o tempo médio de cada
+    etapa em milissegundos, a média de pontos amostrados por quadro e os quadros por segundo."""
+    cena = cena_ampliada(cena, escala)
+    colunas, linhas = grade_de_impressao(*cena["limites"])
+    tela = Tela(StringIO(), incremental=True, altura=float("inf"), largura=float("inf"))
+    perfil = Perfil(janela=len(rotacoes))
+    pontos = 0
+    for rotacao_1, rotacao_2 in rotacoes:
+        perfil.iniciar_quadro()
+        if quantidade is not None:
+            string_total = string_com_amostragem_fixa(cena, rotacao_1, rotacao_2, quantidade, perfil, zoom,
+                                                      deslocamento)
+        elif modo in SUBCELULAS:
+            string_total = string_da_cena_em_subcelulas(cena, rotacao_1, rotacao_2, len(colunas), len(linhas), modo,
+                                                        perfil, zoom, deslocamento)
+        else:
+            string_total = string_da_cena(cena, rotacao_1, rotacao_2, modo == "profundidade", perfil, zoom,
+                                          deslocamento)
+        inicio_saida = perf_counter()
+        tela.saida.seek(0)
+        tela.saida.truncate()
+        tela.desenhar(string_total.split("\n") if modo in SUBCELULAS else centralize_lines(string_total, True, 130))
+        perfil.registrar("saida", inicio_saida, perf_counter())
+        pontos += perfil.contagens["pontos"]
+        perfil.concluir_quadro()
+    etapas_ms = {etapa: 1000 * float(np.mean(perfil.historico[etapa])) for etapa in ETAPAS}
+    total_ms = sum(etapas_ms.values())
+    return {"etapas_ms": etapas_ms, "total_ms": total_ms, "pontos": pontos / len(rotacoes),
+            "quadros_por_segundo": 1000 / total_ms if total_ms else float("inf")}
+
+
+def executar(arestas_sinteticas=(1000, 10000), quantidades=(None, 15, 150), escalas=(1, 2, 4), quadros=20,
+             modelos=(), zooms=(1,), deslocamento=(0, 0), modos=MODOS):
+    """Executa a varredura completa de cenas, modos de impressão, amostragens, tamanhos de grade e ampliações,
+    retornando um dicionário pronto para ser salvo em JSON. As quantidades fixas de pontos por segmento são medidas
+    apenas no modo 'ascii'."""
+    resultados = []
+    for cena in cenas_de_referencia(arestas_sinteticas, modelos):
+        rotacoes = rotacoes_de_teste(cena, quadros)
+        for quantidade in quantidades:
+            for modo in modos if quantidade is None else ("ascii",):
+                for escala in escalas:
+                    for zoom in zooms:
+                        medicao = medir_quadros(cena, rotacoes, quantidade, escala, zoom, deslocamento, modo)
+                        colunas, linhas = grade_de_impressao(*(limite * escala for limite in cena["limites"]))
+                        medicao.update({"cena": cena["nome"],
+                                        "segmentos": len(cena.get("arestas", cena.get("segmentos"))),
+                                        "modo": modo, "amostragem": "dda" if quantidade is None else quantidade,
+                                        "grade": [len(colunas), len(linhas)], "zoom": zoom,
+                                        "deslocamento": list(deslocamento), "quadros": quadros})
+                        resultados.append(medicao)
+    return {"python": platform.python_version(), "numpy": np.__version__, "resultados": resultados}
+
+
+def imprimir_tabela(relatorio):
+    """Imprime os resultados de uma execução em forma de tabela."""
+    cabecalho = "%-14s %9s %12s %10s %9s %6s %9s " % ("cena", "segmentos", "modo", "amostragem", "grade", "zoom",
+                                                        "pontos")
+    print(cabecalho + " ".join("%12s" % etapa for etapa in ETAPAS) + " %10s" % "quadros/s")
+    for r in relatorio["resultados"]:
+        linha = "%-14s %9d %12s %10s %9s %6g %9d " % (r["cena"], r["segmentos"], r["modo"], r["amostragem"],
+                                                       "%dx%d" % tuple(r["grade"]), r["zoom"], r["pontos"])
+        print(linha + " ".join("%9.3f ms" % r["etapas_ms"][etapa] for etapa in ETAPAS) +
+              " %10.1f" % r["quadros_por_segundo"])
+
+
+def main():
+    parser = ArgumentParser(description="Mede, sem terminal, o desempenho de cada etapa da impressão de objetos 3D.")
+    parser.add_argument("--json", help="arquivo em que os resultados são salvos, para comparação entre versões")
+    parser.add_argument("--quadros", type=int, default=20, help="quantidade de rotações medidas por configuração")
+    parser.add_argument("--arestas", type=int, nargs="*", default=[1000, 10000],
+                        help="quantidades de arestas das esferas sintéticas")
+    parser.add_argument("--quantidades", type=int, nargs="*", default=[15, 150],
+                        help="quantidades fixas de pontos por segmento, comparadas com a rasterização DDA")
+    parser.add_argument("--escalas", type=int, nargs="*", default=[1, 2, 4],
+                        help="fatores de aumento da grade de impressão")
+    parser.add_argument("--zooms", type=float, nargs="*", default=[1],
+                        help="ampliações da projeção, que deixam parte da cena fora da tela")
+    parser.add_argument("--deslocamento", type=float, nargs=2, default=[0, 0], metavar=("X", "Y"),
+                        help="ponto do plano de projeção exibido na origem da tela, como com as teclas I/J/K/L")
+    parser.add_argument("--modos", nargs="*", choices=MODOS, default=list(MODOS),
+                        help="modos de impressão medidos com a rasterização DDA")
+    parser.add_argument("--modelos", nargs="*", default=[], help="modelos 3D (OBJ, STL ou PLY) incluídos na medição")
+    argumentos = parser.parse_args()
+    relatorio = executar(argumentos.arestas, [None] + argumentos.quantidades, argumentos.escalas, argumentos.quadros,
+                         argumentos.modelos, argumentos.zooms, tuple(argumentos.deslocamento), argumentos.modos)
+    imprimir_tabela(relatorio)
+    if argumentos.json:
+        with open(argumentos.json, "w") as arquivo:
+            json.dump(relatorio, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
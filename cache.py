@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from sys import getsizeof
+
+
+class CacheDeQuadros:
+    """Cache LRU de quadros já renderizados, indexada pela cena e pelo par de rotações do plano de projeção, com um
+    limite de memória em bytes. Os ângulos são quantizados em múltiplos de 'quantum', para absorver erros de
+    arredondamento."""
+
+    def __init__(self, limite_bytes=64 * 2 ** 20, quantum=1e-6):
+        self.limite_bytes = limite_bytes
+        self.quantum = quantum
+        self.quadros = OrderedDict()
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def chave(self, cena, rotacao_1, rotacao_2, extras=()):
+        """Retorna a chave de um quadro. 'extras' reúne outros parâmetros dos quais o quadro depende."""
+        return id(cena), round(rotacao_1 / self.quantum), round(rotacao_2 / self.quantum), tuple(extras)
+
+    def obter(self, cena, rotacao_1, rotacao_2, gerar, extras=()):
+        """Retorna o quadro da cena nos ângulos dados, renderizando-o com 'gerar(rotacao_1, rotacao_2)' apenas se ele
+        ainda não estiver na cache."""
+        chave = self.chave(cena, rotacao_1, rotacao_2, extras)
+        if chave in self.quadros:
+            self.acertos += 1
+            self.quadros.move_to_end(chave)
+            return self.quadros[chave][1]
+        self.falhas += 1
+        quadro = gerar(rotacao_1, rotacao_2)
+        self._guardar(chave, cena, quadro)
+        return quadro
+
+    def pre_carregar(self, cena, angulos, gerar, extras=()):
+        """Pré-carrega o primeiro quadro ausente entre os pares de ângulos dados, na ordem dada, sem alterar as contagens
+        de acertos e falhas. Retorna False quando todos já estão na cache."""
+        for angulo_1, angulo_2 in angulos:
+            chave = self.chave(cena, angulo_1, angulo_2, extras)
+            if chave not in self.quadros:
+                self._guardar(chave, cena, gerar(angulo_1, angulo_2))
+                return True
+        return False
+
+    def pre_carregar_vizinhos(self, cena, rotacao_1, rotacao_2, passo, gerar, extras=(), raio=2):
+        """Pré-carrega o primeiro quadro ausente entre os vizinhos dos ângulos dados, a até 'raio' passos de
+        distância, dos mais próximos aos mais distantes. Retorna False quando todos já estão na cache."""
+        vizinhos = [(rotacao_1 + passos_1 * passo, rotacao_2 + passos_2 * passo)
+                    for distancia in range(1, raio + 1)
+                    for passos_1 in range(-distancia, distancia + 1)
+                    for passos_2 in range(-distancia, distancia + 1)
+                    if max(abs(passos_1), abs(passos_2)) == distancia]
+        return self.pre_carregar(cena, vizinhos, gerar, extras)
+
+    def _guardar(self, chave, cena, quadro):
+        """Insere um quadro como o mais recente, descartando os menos recentes até que o limite de memória seja
+        respeitado. Quadros maiores que o próprio limite não são guardados."""
+        tamanho = getsizeof(quadro)
+        if tamanho > self.limite_bytes:
+            return
+        # A referência à cena impede que o seu identificador, usado na chave, seja reaproveitado por outro objeto:
+        self.quadros[chave] = (cena, quadro, tamanho)
+        self.bytes += tamanho
+        while self.bytes > self.limite_bytes:
+            _, (_, _, tamanho_descartado) = self.quadros.popitem(last=False)
+            self.bytes -= tamanho_descartado
+            self.descartes += 1
@@ -0,0 +1,135 @@
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import pi
+from os import cpu_count, makedirs, path
+from time import perf_counter
+
+from PIL import Image
+
+from geometria import cubo, tetraedro, projecao_da_cena, raio_da_cena
+from malhas import carregar_malha
+from rasterizacao import rasterizar_imagem
+
+# Cena compartilhada por cada processo de renderização, definida uma única vez na criação do processo, em vez de ser
+# enviada junto de cada quadro:
+_cena_do_processo = None
+
+
+def rotacoes_da_volta(cena, quadros, voltas=1, inclinacao=None):
+    """Retorna os pares (Rotacao_1, Rotacao_2) de uma animação em que a cena gira 'voltas' vezes em torno do eixo 'z',
+    com o plano de projeção inclinado em 'inclinacao' (por padrão, a rotação inicial da cena). Assim como no programa
+    interativo, os ângulos são dados em múltiplos de pi."""
+    if inclinacao is None:
+        inclinacao = cena["rotacao_2"]
+    return [(cena["rotacao_1"] + 2 * voltas * n / quadros, inclinacao) for n in range(quadros)]
+
+
+def renderizar_imagem(cena, rotacao_1, rotacao_2, largura=400, altura=400, suavizar=False, profundidade=False,
+                      zoom=1, deslocamento=(0, 0)):
+    """Renderiza a cena nos ângulos dados e retorna a imagem em tons de cinza de 'largura' por 'altura' pixels, com o
+    mesmo enquadramento ('zoom' e 'deslocamento') de 'string_da_cena'."""
+    extremidades = projecao_da_cena(cena, pi * rotacao_1, pi * rotacao_2, profundidade)
+    raio = raio_da_cena(cena) if profundidade else None
+    x_min, x_max, y_min, y_max = cena["limites"]
+    janela = (x_min / zoom + deslocamento[0], x_max / zoom + deslocamento[0], y_min / zoom + deslocamento[1],
+              y_max / zoom + deslocamento[1])
+    return Image.fromarray(rasterizar_imagem(extremidades, *janela, largura, altura, suavizar, raio), "L")
+
+
+def _inicializar_processo(cena):
+    global _cena_do_processo
+    _cena_do_processo = cena
+
+
+def _renderizar_quadro(indice, rotacao_1, rotacao_2, resolucao, suavizar, profundidade, arquivo):
+    """Tarefa executada em cada processo: renderiza um quadro e, se 'arquivo' for dado, salva-o diretamente, retornando
+    apenas o índice; caso contrário, retorna a imagem, para a montagem de um GIF."""
+    imagem = renderizar_imagem(_cena_do_processo, rotacao_1, rotacao_2, *resolucao, suavizar, profundidade)
+    if arquivo is not None:
+        imagem.save(arquivo)
+        return indice, None
+    return indice, imagem
+
+
+def _quadros_em_ordem(executor, tarefas, max_em_voo):
+    """Envia as tarefas de renderização ao executor, com no máximo 'max_em_voo' pendentes ao mesmo tempo, e gera os
+    seus resultados na ordem de envio."""
+    pendentes = deque()
+    for tarefa in tarefas:
+        # Antes de enviar um novo quadro, aguarda-se o mais antigo, caso o limite de quadros pendentes seja atingido:
+        if len(pendentes) >= max_em_voo:
+            yield pendentes.popleft().result()
+        pendentes.append(executor.submit(_renderizar_quadro, *tarefa))
+    while pendentes:
+        yield pendentes.popleft().result()
+
+
+def exportar_animacao(cena, destino, rotacoes, resolucao=(400, 400), suavizar=False, processos=None, max_em_voo=None,
+                      duracao=40, profundidade=False):
+    """Renderiza, em paralelo, um quadro da cena para cada par de rotações, salvando uma sequência numerada de PNGs
+    ou, se 'destino' terminar em '.gif', um GIF animado. Retorna a quantidade de quadros, o tempo total e os quadros
+    por segundo."""
+    gif = destino.lower().endswith(".gif")
+    if not gif and "%" not in destino:
+        raiz, extensao = path.splitext(destino)
+        destino = raiz + "_%04d" + (extensao or ".png")
+    if path.dirname(destino):
+        makedirs(path.dirname(destino), exist_ok=True)
+    processos = processos or cpu_count() or 1
+    if max_em_voo is None:
+        max_em_voo = 2 * processos
+    tarefas = ((indice, rotacao_1, rotacao_2, resolucao, suavizar, profundidade, None if gif else destino % indice)
+               for indice, (rotacao_1, rotacao_2) in enumerate(rotacoes))
+    inicio = perf_counter()
+    with ProcessPoolExecutor(processos, initializer=_inicializar_processo, initargs=(cena,)) as executor:
+        imagens = (imagem for _, imagem in _quadros_em_ordem(executor, tarefas, max_em_voo))
+        if gif:
+            # O primeiro quadro abre o GIF, e os demais são entregues ao Pillow à medida que são renderizados:
+            primeira = next(imagens, None)
+            if primeira is not None:
+                primeira.save(destino, save_all=True, append_images=imagens, duration=duracao, loop=0)
+        else:
+            deque(imagens, maxlen=0)
+    segundos = perf_counter() - inicio
+    return {"quadros": len(rotacoes), "segundos": segundos,
+            "quadros_por_segundo": len(rotacoes) / segundos if segundos else float("inf")}
+
+
+def cena_pelo_nome(objeto):
+    """Retorna a cena do cubo ('c'), do tetraedro ('t') ou do modelo 3D no caminho dado."""
+    if objeto == "c":
+        return cubo()
+    if objeto == "t":
+        return tetraedro()
+    return carregar_malha(objeto)
+
+
+def main():
+    parser = ArgumentParser(description="Exporta, sem terminal, uma animação de um objeto 3D girando em torno do eixo "
+                                        "'z', como sequência de PNGs ou GIF animado.")
+    parser.add_argument("objeto", help="'c' (cubo), 't' (tetraedro) ou o caminho de um modelo OBJ, STL ou PLY")
+    parser.add_argument("destino", help="arquivo '.gif' ou padrão de PNGs numerados, como 'quadros/quadro_%%04d.png'")
+    parser.add_argument("--quadros", type=int, default=120, help="quantidade de quadros da animação")
+    parser.add_argument("--voltas", type=float, default=1, help="quantidade de voltas em torno do eixo 'z'")
+    parser.add_argument("--inclinacao", type=float, help="Rotacao_2 fixa durante a animação, em múltiplos de pi")
+    parser.add_argument("--largura", type=int, default=400, help="largura dos quadros, em pixels")
+    parser.add_argument("--altura", type=int, default=400, help="altura dos quadros, em pixels")
+    parser.add_argument("--suavizar", action="store_true", help="desenha linhas sem serrilhado")
+    parser.add_argument("--profundidade", action="store_true",
+                        help="desenha as partes mais distantes do observador em tons mais claros")
+    parser.add_argument("--processos", type=int, help="quantidade de processos (por padrão, um por núcleo)")
+    parser.add_argument("--em-voo", type=int, help="máximo de quadros pendentes ao mesmo tempo")
+    parser.add_argument("--duracao", type=int, default=40, help="milissegundos por quadro do GIF")
+    argumentos = parser.parse_args()
+    cena = cena_pelo_nome(argumentos.objeto)
+    rotacoes = rotacoes_da_volta(cena, argumentos.quadros, argumentos.voltas, argumentos.inclinacao)
+    resultado = exportar_animacao(cena, argumentos.destino, rotacoes, (argumentos.largura, argumentos.altura),
+                                  argumentos.suavizar, argumentos.processos, argumentos.em_voo, argumentos.duracao,
+                                  argumentos.profundidade)
+    print("%d quadros exportados em %.2f s (%.1f quadros/s)." % (resultado["quadros"], resultado["segundos"],
+                                                                resultado["quadros_por_segundo"]))
+
+
+if __name__ == "__main__":
+    main()
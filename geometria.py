@@ -0,0 +1,108 @@
+import numpy as np
+from math import cos, sin, pi
+
+
+def rotacionar_ponto_x(x, y, teta):
+    """A partir das coordenadas x e y de um ponto, retorna a componente x do mesmo ponto, porém utilizando-se
+    como referência a rotação dos eixos por 'teta', no sentido anti-horário."""
+    return x * cos(teta) - y * sin(teta)
+
+
+def rotacionar_ponto_y(x, y, teta):
+    """A partir das coordenadas x e y de um ponto, retorna a componente y do mesmo ponto, porém utilizando-se
+    como referência a rotação dos eixos por 'teta', no sentido anti-horário."""
+    return x * sin(teta) + y * cos(teta)
+
+
+def rotacionar_pontos(pontos, teta_1, teta_2):
+    """Recebe um array de pontos tridimensionais, com formato (..., 3), e retorna as coordenadas (i', j', k') de cada
+    um deles em relação ao plano de projeção rotacionado por 'teta_1' e 'teta_2'. Os senos e cossenos são calculados uma
+    única vez, de modo que todos os pontos da cena sejam rotacionados em uma só passagem vetorizada."""
+    pontos = np.asarray(pontos, dtype=float)
+    cos_1, sin_1, cos_2, sin_2 = cos(teta_1), sin(teta_1), cos(teta_2), sin(teta_2)
+    rotacionados = np.empty(pontos.shape)
+    # Rotacionar o plano de projeção em torno do eixo 'z', utilizando-se 'teta_1':
+    i_1 = pontos[..., 0] * cos_1 - pontos[..., 1] * sin_1
+    j_1 = pontos[..., 0] * sin_1 + pontos[..., 1] * cos_1
+    k_1 = pontos[..., 2]
+    # Rotacionar o eixo de projeção em torno do eixo 'i', utilizando-se 'teta_2':
+    rotacionados[..., 0] = i_1
+    rotacionados[..., 1] = j_1 * cos_2 - k_1 * sin_2
+    rotacionados[..., 2] = j_1 * sin_2 + k_1 * cos_2
+    return rotacionados
+
+
+def projecao_dos_segmentos_no_plano(segmentos, teta_1, teta_2):
+    """Calcula e retorna, em um array de formato (N, 2, 2), as coordenadas da projeção das extremidades de todos os
+    segmentos tridimensionais de um array (N, 2, 3) no plano de projeção de ângulos 'teta_1' e 'teta_2'."""
+    return rotacionar_pontos(segmentos, teta_1, teta_2)[..., ::2]
+
+
+def projecao_do_segmento_no_plano(segmento, teta_1, teta_2):
+    """Calcula e retorna as coordenadas da projeção das extremidades de um segmento tridimensional em um plano, o qual
+    passa pela origem do espaço 3D e possui ângulos de rotação 'teta_1' e 'teta_2'."""
+    return projecao_dos_segmentos_no_plano([segmento], teta_1, teta_2)[0].tolist()
+
+
+def projecao_da_cena(cena, teta_1, teta_2, profundidade=False):
+    """Calcula e retorna, em um array (N, 2, 2), a projeção das extremidades de todos os segmentos de uma cena. Com
+    'profundidade', retorna um array (N, 2, 3), com a coordenada 'j'' de cada extremidade como terceira componente."""
+    componentes = [0, 2, 1] if profundidade else [0, 2]
+    if "arestas" in cena:
+        return rotacionar_pontos(cena["vertices"], teta_1, teta_2)[:, componentes][cena["arestas"]]
+    return rotacionar_pontos(cena["segmentos"], teta_1, teta_2)[..., componentes]
+
+
+def raio_da_cena(cena):
+    """Retorna a maior distância entre a origem e um ponto da cena, que não depende da rotação do plano de projeção."""
+    pontos = cena["vertices"] if "arestas" in cena else cena["segmentos"]
+    return float(np.sqrt((np.asarray(pontos) ** 2).sum(axis=-1)).max()) if np.size(pontos) else 0.
+
+
+def cubo(tamanho_aresta=20):
+    """Retorna a cena de um cubo centrado na origem: seus segmentos, a rotação inicial do plano de projeção e os limites
+    desse plano."""
+    segmentos = []
+    t = tamanho_aresta / 2
+    for i in [t, -t]:
+        for j in [t, -t]:
+            segmentos.append([[i, j, t], [i, j, -t]])
+    for i in [t, -t]:
+        for k in [t, -t]:
+            segmentos.append([[i, t, k], [i, -t, k]])
+    for j in [t, -t]:
+        for k in [t, -t]:
+            segmentos.append([[t, j, k], [-t, j, k]])
+    return {"nome": "cubo", "segmentos": np.array(segmentos, dtype=float),
+            "rotacao_1": .31, "rotacao_2": .15, "limites": (-20, 20, -20, 20)}
+
+
+def tetraedro(tamanho_aresta=10):
+    """Retorna a cena de um tetraedro: seus segmentos, a rotação inicial do plano de projeção e os limites desse
+    plano."""
+    segmentos = []
+    t = 3 ** (1 / 2) * tamanho_aresta
+    coordenadas_base = [[0, t, (1-3**(1/2))*t], [-3**(1/2)*t/2, -t/2, (1-3**(1/2))*t],
+                        [3**(1/2)*t/2, -t/2, (1-3**(1/2))*t]]
+    for i in coordenadas_base:
+        segmentos.append([[0, 0, (2 ** (1 / 2) - 2 ** (1 / 2) + 1) * t], i])
+    for i in range(-1, 2):
+        segmentos.append([coordenadas_base[i], coordenadas_base[i + 1]])
+    return {"nome": "tetraedro", "segmentos": np.array(segmentos, dtype=float),
+            "rotacao_1": 0, "rotacao_2": -.1, "limites": (-20, 20, -21, 18)}
+
+
+def malha_sintetica(quantidade_de_arestas, raio=18):
+    """Retorna a cena de uma esfera em malha de meridianos e paralelos com aproximadamente 'quantidade_de_arestas'
+    segmentos, utilizada para medir o desempenho com modelos grandes."""
+    n = max(int(np.ceil((quantidade_de_arestas / 2) ** (1 / 2))), 2)
+    latitude = np.linspace(0, pi, n + 1)[:, None]
+    longitude = np.linspace(0, 2 * pi, n, endpoint=False)[None, :]
+    vertices = np.stack(np.broadcast_arrays(raio * np.sin(latitude) * np.cos(longitude),
+                                            raio * np.sin(latitude) * np.sin(longitude),
+                                            raio * np.cos(latitude)), axis=-1)
+    # Arestas ao longo dos meridianos (entre latitudes vizinhas) e dos paralelos (entre longitudes vizinhas):
+    meridianos = np.stack((vertices[:-1], vertices[1:]), axis=2).reshape(-1, 2, 3)
+    paralelos = np.stack((vertices[1:-1], np.roll(vertices[1:-1], -1, axis=1)), axis=2).reshape(-1, 2, 3)
+    return {"nome": "esfera_%d" % quantidade_de_arestas, "segmentos": np.concatenate((meridianos, paralelos)),
+            "rotacao_1": .31, "rotacao_2": .15, "limites": (-20, 20, -20, 20)}
@@ -1,130 +1,23 @@
-import numpy as np
-from PIL import Image
-from math import cos, sin, pi
-from os import system
-from sys import stdin
-from termios import tcgetattr, tcsetattr, TCSADRAIN
-from tty import setraw
+from argparse import ArgumentParser
+from os import path
+from shutil import get_terminal_size
+from time import perf_counter
 
-
-def getch():
-    """Recebe e retorna um caractere digitado pelo usuário, sem ser necessário apertar 'enter'."""
-    fd = stdin.fileno()
-    old_settings = tcgetattr(fd)
-    try:
-        setraw(stdin.fileno())
-        ch = stdin.read(1)
-    finally:
-        tcsetattr(fd, TCSADRAIN, old_settings)
-    return ch
-
-
-def centralize(string, centralize_vertically=True, page_width=None, page_height=None):
-    """Recebe e imprime uma string, centralizando cada uma de suas linhas."""
-    lines_string = string.split("\n")
-    if page_width is None:
-        page_width = 135
-    if page_height is None:
-        page_height = 40
-    if centralize_vertically:
-        print("\n"*int((page_height-len(lines_string))/2))
-    for l in lines_string:
-        space = int((page_width - len(l)) / 2)
-        print(space * " " + l)
-
-
-def rotacionar_ponto_x(x, y, teta):
-    """A partir das coordenadas x e y de um ponto, retorna a componente x do mesmo ponto, porém utilizando-se
-    como referência a rotação dos eixos por 'teta', no sentido anti-horário."""
-    return x * cos(teta) - y * sin(teta)
-
-
-def rotacionar_ponto_y(x, y, teta):
-    """A partir das coordenadas x e y de um ponto, retorna a componente y do mesmo ponto, porém utilizando-se
-    como referência a rotação dos eixos por 'teta', no sentido anti-horário."""
-    return x * sin(teta) + y * cos(teta)
-
-
-def projecao_do_segmento_no_plano(segmento, teta_1, teta_2):
-    """Calcula e retorna as coordenadas da projeção das extremidades de um segmento tridimensional em um plano, o qual
-    passa pela origem do espaço 3D e possui ângulos de rotação 'teta_1' e 'teta_2'."""
-    # Rotacionar o plano de projeção em torno do eixo 'z', utilizando-se 'teta_1':
-    seg_1_i = [rotacionar_ponto_x(seg[0], seg[1], teta_1) for seg in segmento]
-    seg_1_j = [rotacionar_ponto_y(seg[0], seg[1], teta_1) for seg in segmento]
-    seg_1_k = [seg[2] for seg in segmento]
-    segmento_rotacao_1 = [[seg_1_i[n], seg_1_j[n], seg_1_k[n]] for n in range(0, 2)]
-    # Rotacionar o eixo de projeção em torno do eixo 'i', utilizando-se 'teta_2':
-    seg_2_i = [seg[0] for seg in segmento_rotacao_1]
-    seg_2_j = [rotacionar_ponto_x(seg[1], seg[2], teta_2) for seg in segmento_rotacao_1]
-    seg_2_k = [rotacionar_ponto_y(seg[1], seg[2], teta_2) for seg in segmento_rotacao_1]
-    segmento_rotacao_2 = [[seg_2_i[n], seg_2_j[n], seg_2_k[n]] for n in range(0, 2)]
-    # Projeção das extremidades do segmento tridimensional no plano rotacionado:
-    projecao_vetor_no_plano = [[seg[0], seg[2]] for seg in segmento_rotacao_2]
-    return projecao_vetor_no_plano
-
-
-def coordenadas_continuas_de_segmento_bidimensional(segmento, quantidade):
-    """A partir das coordenadas das extremidades de um segmento bidimensional, retorna uma quantidade de
-    coordenadas que correspondem com os pontos entre as próprias extremidades."""
-    lista_coordenadas = []
-    coordenadas_x = np.linspace(segmento[0][0], segmento[1][0], quantidade)
-    coordenadas_y = np.linspace(segmento[0][1], segmento[1][1], quantidade)
-    for c in range(0, quantidade):
-        lista_coordenadas.append([coordenadas_x[c], coordenadas_y[c]])
-    return lista_coordenadas
-
-
-def verificacao_de_lista(x, y, coordenadas):
-    """Verifica, com um grau de incerteza, se um ponto (x, y) está em uma lista de coordenadas."""
-    incerteza = .5
-    for c in coordenadas:
-        if (abs(c[0] - x) <= incerteza) and (abs(c[1] - y) <= incerteza):
-            return True
-    return False
-
-
-def imprimir_interface(x_min, x_max, y_min, y_max, coordenadas):
-    """A partir de uma lista de coordenadas, imprime o gráfico do conjunto de pontos dado."""
-    y = y_max  # Tamanho vertical da tela de impressão
-    string_total = "\n"
-    while y >= y_min:
-        string_linha = str(y) + " " * (6 - len(str(y)))
-        x = x_min
-        while x <= x_max:
-            if verificacao_de_lista(x, y, coordenadas):
-                string_linha += "*"
-            elif abs(x) < .5:
-                string_linha += "|"
-            else:
-                string_linha += " "
-            x += .5
-        string_total += string_linha + "\n"
-        y -= 1
-    centralize(string_total, True, 130)
-
-
-def coordenadas_para_imagem(coordenadas):
-    dados = np.ones((X_max-X_min, Y_max-Y_min, 3), dtype=np.uint8)*255
-    color = False
-    if color:
-        for y in range(Y_max-Y_min):
-            for x in range(X_max-X_min):
-                dados[x, y] = [int(x/22-15)**2, int(x/22-9)**2, int(x/22-3)**2]
-    for c in coordenadas:
-        dados[int(c[1]-X_min), int(c[0]-Y_min)] = np.zeros(3)
-    dados = dados[::-1]
-    im = Image.fromarray(dados, 'RGB')
-    im.save("my.png")
-    im.show()
+from cache import CacheDeQuadros
+from exportacao import renderizar_imagem
+from geometria import cubo, tetraedro
+from malhas import carregar_malha
+from perfil import Perfil
+from rasterizacao import SUBCELULAS, string_da_cena, string_da_cena_em_subcelulas
+from terminal import Tela, Teclado, centralize_lines
 
 
-def funcionamento():
+def funcionamento(tela, teclado):
     view_manual = True
     page = 1
     while view_manual:
-        system('clear')
         if page == 1:
-            centralize("""
+            pagina = """
 -------------------------------------------------------------------------------------------------------------
 |                                                                                                           |
 |                    COMO FUNCIONA O SISTEMA DE DEFINIÇÃO DE UM SEGMENTO TRIDIMENCIONAL:                    |
@@ -146,9 +39,9 @@ def funcionamento():
 |  Ex.: Segmento = [[-4, 3, 5], [9, 20, -4.3]].                                                             |
 |                                                                                                    Pág. 1 |
 -------------------------------------------------------------------------------------------------------------
-""")
-        if page == 2:
-            centralize("""
+"""
+        elif page == 2:
+            pagina = """
 -------------------------------------------------------------------------------------------------------------
 |                                                                                                           |
 |                       COMO FUNCIONA O SISTEMA DE DEFINIÇÃO DO PLANO DE PROJEÇÃO:                          |
@@ -170,9 +63,9 @@ def funcionamento():
 |  De mesmo modo, com as teclas 'W' e 'S', o usuário pode rotacionar o plano em torno do eixo 'i'.          |
 |                                                                                                    Pág. 2 |
 -------------------------------------------------------------------------------------------------------------
-""")
-        if page == 3:
-            centralize("""
+"""
+        elif page == 3:
+            pagina = """
 -------------------------------------------------------------------------------------------------------------
 |                                                                                                           |
 |               COMO FUNCIONA O SISTEMA DE PROJEÇÃO DAS EXTREMIDADES DE UM SEGMENTO NO PLANO:               |
@@ -194,9 +87,9 @@ def funcionamento():
 |                                                                                                           |
 |                                                                                                    Pág. 3 |
 -------------------------------------------------------------------------------------------------------------
-""")
-        if page == 4:
-            centralize("""
+"""
+        elif page == 4:
+            pagina = """
 -------------------------------------------------------------------------------------------------------------
 |                                                                                                           |
 |                  COMO FUNCIONA O SISTEMA DE IMPRESSÃO DOS SEGMENTOS PROJETADOS NO PLANO:                  |
@@ -218,9 +111,13 @@ def funcionamento():
 |                                                                                                           |
 |                                                                                                    Pág. 4 |
 -------------------------------------------------------------------------------------------------------------
-""")
-        centralize("[A] -> Página anterior   [D] -> Página seguinte   [Q] -> Sair", False)
-        alter_page = getch().lower()
+"""
+        tela.desenhar(centralize_lines(pagina) +
+                      centralize_lines("[A] -> Página anterior   [D] -> Página seguinte   [Q] -> Sair", False))
+        alter_page = teclado.tecla().lower()
+        if teclado.redimensionado:
+            teclado.redimensionado = False
+            tela.redesenhar()
         if (alter_page == "a") and (1 < page <= 4):
             page -= 1
         if (alter_page == "d") and (1 <= page < 4):
@@ -229,22 +126,80 @@ def funcionamento():
             view_manual = False
 
 
-# Variáveis de início:
-Start = True
-Debug = False
-Selection = True
-Print = False
-Scale = 10
-Speed = 0.025
-# Loop principal do programa:
-while True:
-    # Recebimento de dados pelo usuário:
-    while Selection:
-        Selection = False
-        if Start:
-            Start = False
-            system('clear')
-            centralize("""\n
+def carregar_cena(caminho, modelos_carregados):
+    """Retorna a cena de um modelo 3D, lendo o arquivo apenas na primeira vez em que é selecionado. Em caso de erro,
+    retorna None e uma mensagem para o usuário."""
+    if caminho not in modelos_carregados:
+        try:
+            modelos_carregados[caminho] = carregar_malha(caminho)
+        except (OSError, ValueError, IndexError) as erro:
+            return None, "Não foi possível carregar '%s': %s" % (caminho, erro)
+    return modelos_carregados[caminho], ""
+
+
+def main(modelos=(), limite_cache=64 * 2 ** 20, pre_carregar=True, quadros_por_segundo=30, rastro=None, modo="ascii"):
+    """Ponto de entrada interativo do programa, que mantém o terminal em modo bruto durante toda a sessão. Se 'rastro'
+    for dado, os tempos de cada etapa de todos os quadros impressos são gravados nesse arquivo."""
+    perfil = Perfil(rastro=rastro)
+    try:
+        with Teclado() as teclado:
+            sessao(teclado, modelos, limite_cache, pre_carregar, quadros_por_segundo, perfil, modo)
+    finally:
+        perfil.fechar()
+
+
+def sessao(teclado, modelos=(), limite_cache=64 * 2 ** 20, pre_carregar=True, quadros_por_segundo=30, perfil=None,
+           modo="ascii"):
+    """Menu inicial, seleção de objetos e loop de impressão, com os modelos dados exibidos no menu inicial, a cache
+    de quadros, o giro automático a 'quadros_por_segundo' e os tempos de cada quadro registrados em 'perfil'."""
+    if perfil is None:
+        perfil = Perfil()
+    # Variáveis de início:
+    Modelos = list(modelos)[:9]
+    Modelos_carregados = {}
+    Cenas = {}
+    Cache = CacheDeQuadros(limite_cache)
+    Aviso = ""
+    Start = True
+    Debug = False
+    Selection = True
+    Print = False
+    Profundidade = False
+    Giro = False
+    Quadros_perdidos = 0
+    Tempo_quadro = 0
+    Orcamento = 1 / quadros_por_segundo
+    Scale = 10
+    Speed = 0.025
+    Modos = ("ascii",) + tuple(SUBCELULAS)
+    Modo = modo
+    Tamanho = None
+    Tela_terminal = Tela()
+
+    def gerar_quadro(rotacao_1, rotacao_2, perfil_do_quadro=None):
+        """Renderiza a cena atual nos ângulos dados, com o modo de impressão e o enquadramento atuais."""
+        if Modo == "ascii":
+            return string_da_cena(Cena, rotacao_1, rotacao_2, Profundidade, perfil_do_quadro, Zoom, Deslocamento)
+        return string_da_cena_em_subcelulas(Cena, rotacao_1, rotacao_2, *Tamanho, Modo, perfil_do_quadro, Zoom,
+                                            Deslocamento)
+
+    def pre_carregar_quadro(rotacao_1, rotacao_2):
+        """Renderiza um quadro vizinho enquanto o programa aguarda o usuário, registrando-o no perfil como
+        pré-carregado, já que os quadros impressos em seguida costumam ser obtidos da cache, sem tempos de
+        renderização."""
+        perfil.iniciar_quadro()
+        quadro = gerar_quadro(rotacao_1, rotacao_2, perfil)
+        perfil.concluir_quadro(True, cena=Cena["nome"], rotacao_1=rotacao_1, rotacao_2=rotacao_2)
+        return quadro
+
+    # Loop principal do programa:
+    while True:
+        # Recebimento de dados pelo usuário:
+        while Selection:
+            Selection = False
+            if Start:
+                Start = False
+                Tela_terminal.desenhar(centralize_lines("""\n
 * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
 * ------------------------------------------------------- *
 * ------ SEJA BEM-VINDO À SIMULAÇÃO GEOMÉTRICA 3D! ------ *
@@ -253,109 +208,185 @@ while True:
 * ------------------------------------------------------- *
 * --- Escolha um dos itens a seguir para a simulação: --- *
 * ------------------------------------------------------- *
-* * * * * * * * * * * * * * * * * * * * * * * * * * * * * *\n""")
-            centralize("""\n[C] -> Cubo   [T] -> Tetraedro   [F] -> Funcionamento   [Q] -> Sair""", False)
-            Objeto = getch().lower()
-        # Seleção de objeto tridimensional da base de dados:
-        Segmentos = []
-        if Objeto == "c":  # Cubo.
-            Tamanho_aresta = 20
-            t = Tamanho_aresta / 2
-            for i in [t, -t]:
-                for j in [t, -t]:
-                    Segmentos.append([[i, j, t], [i, j, -t]])
-            for i in [t, -t]:
-                for k in [t, -t]:
-                    Segmentos.append([[i, t, k], [i, -t, k]])
-            for j in [t, -t]:
-                for k in [t, -t]:
-                    Segmentos.append([[t, j, k], [-t, j, k]])
-            # Definição da rotação inicial do plano de projeção:
-            Rotacao_1 = .31
-            Rotacao_2 = .15
-            # Estabelecimento dos limites do plano de projeção:
-            X_min = -20
-            X_max = 20
-            Y_min = -20
-            Y_max = 20
-            Quantidade = 15
-        elif Objeto == "t":  # Tetraedro.
-            Tamanho_aresta = 10
-            t = 3 ** (1 / 2) * Tamanho_aresta
-            Coordenadas_base = [[0, t, (1-3**(1/2))*t], [-3**(1/2)*t/2, -t/2, (1-3**(1/2))*t],
-                                [3**(1/2)*t/2, -t/2, (1-3**(1/2))*t]]
-            for i in Coordenadas_base:
-                Segmentos.append([[0, 0, (2 ** (1 / 2) - 2 ** (1 / 2) + 1) * t], i])
-            for i in range(-1, 2):
-                Segmentos.append([Coordenadas_base[i], Coordenadas_base[i + 1]])
-            # Definição da rotação inicial do plano de projeção:
-            Rotacao_1 = 0
-            Rotacao_2 = -.1
-            # Estabelecimento dos limites do plano de projeção:
-            X_min = -20
-            X_max = 20
-            Y_min = -21
-            Y_max = 18
-            Quantidade = 20
-        elif Objeto == "f":
-            funcionamento()
-            Selection = True
-            Start = True
-        elif Objeto == "q":
-            print()
-            exit()
-        else:
-            Selection = True
-            Start = True
-    # Cálculo e impressão dos segmentos tridimensionais projetados no plano bidimensional:
-    Render = True
-    while Render:
-        # Definição das coordenadas da projeção dos pontos pertencentes a cada um dos segmentos dados:
-        Coordenadas = []
-        if Print:
-            X_min, X_max, Y_min, Y_max, Quantidade = X_min*Scale, X_max*Scale, Y_min*Scale, Y_max*Scale, Quantidade*1000
-            Segmentos = [[[i*10 for i in j] for j in k] for k in Segmentos]
-        for s in Segmentos:
-            Extremidades_s_plano_projecao = projecao_do_segmento_no_plano(s, pi * Rotacao_1, pi * Rotacao_2)
-            Coordenadas_s = coordenadas_continuas_de_segmento_bidimensional(Extremidades_s_plano_projecao, Quantidade)
-            for i in Coordenadas_s: Coordenadas.append(i)
-        # Impressão do plano de projeção:
-        system('clear')
-        if Print:
-            coordenadas_para_imagem(Coordenadas)
-            X_min, X_max, Y_min, Y_max, Quantidade = int(X_min / Scale), int(X_max / Scale), int(Y_min / Scale), int(Y_max / Scale), int(Quantidade / 1000)
-            Segmentos = [[[int(i/10) for i in j] for j in k] for k in Segmentos]
-        else:
-            imprimir_interface(X_min, X_max, Y_min, Y_max, Coordenadas)
-        if Debug:
-            Rot_1_d = Rotacao_1*180
-            Rot_2_d = Rotacao_2*180
-            print("Rotação em torno do eixo 'z': %.2fº;\nRotação em torno do eixo 'i': %.2fº.\n" % (Rot_1_d, Rot_2_d))
-        centralize("[W/A/S/D] -> Movimento | [R] -> Reposicionar | [P] -> Imprimir | [Q] -> Sair", False)
-        # Modificações geradas pela interação do usuário:
-        if not Print: Register = True
-        Print = False
-        while Register:
-            Register = False
-            Button = getch().lower()
-            if Button == "w":
-                Rotacao_2 -= Speed
-            elif Button == "a":
-                Rotacao_1 -= Speed
-            elif Button == "s":
-                Rotacao_2 += Speed
-            elif Button == "d":
-                Rotacao_1 += Speed
-            elif Button == "r":
-                Render = False
+* * * * * * * * * * * * * * * * * * * * * * * * * * * * * *\n""") +
+                                       centralize_lines("""\n[C] -> Cubo   [T] -> Tetraedro   [M] -> Modelo   [F] -> Funcionamento   [Q] -> Sair""", False) +
+                                       centralize_lines("   ".join("[%d] -> %s" % (n + 1, path.basename(m))
+                                                                  for n, m in enumerate(Modelos)), False) +
+                                       centralize_lines(Aviso, False))
+                Aviso = ""
+                Objeto = teclado.tecla().lower()
+                if teclado.redimensionado:
+                    teclado.redimensionado = False
+                    Tela_terminal.redesenhar()
+            # Seleção de objeto tridimensional da base de dados:
+            if Objeto == "c":  # Cubo.
+                Cena = Cenas.setdefault("c", cubo())
+            elif Objeto == "t":  # Tetraedro.
+                Cena = Cenas.setdefault("t", tetraedro())
+            elif Objeto == "m":  # Modelo lido de um arquivo OBJ, STL ou PLY.
+                Tela_terminal.desenhar(centralize_lines("Caminho do modelo (OBJ, STL ou PLY):", False))
+                with teclado.modo_normal():
+                    Caminho = input(" ").strip()
+                Tela_terminal.redesenhar()
+                Cena, Aviso = carregar_cena(Caminho, Modelos_carregados)
+                if Cena is None:
+                    Selection = True
+                    Start = True
+                elif Caminho not in Modelos and len(Modelos) < 9:
+                    Modelos.append(Caminho)
+            elif Objeto in [str(n + 1) for n in range(len(Modelos))]:
+                Cena, Aviso = carregar_cena(Modelos[int(Objeto) - 1], Modelos_carregados)
+                if Cena is None:
+                    Selection = True
+                    Start = True
+            elif Objeto == "f":
+                funcionamento(Tela_terminal, teclado)
                 Selection = True
-            elif Button == "z":
-                Debug = not Debug
-            elif Button == "p":
-                Print = True
-            elif Button == "q":
-                Render = False
+                Start = True
+            elif Objeto == "q":
+                print()
+                return
+            else:
                 Selection = True
                 Start = True
+        # Rotação inicial e limites do plano de projeção da cena:
+        Rotacao_1, Rotacao_2 = Cena["rotacao_1"], Cena["rotacao_2"]
+        X_min, X_max, Y_min, Y_max = Cena["limites"]
+        # Ampliação da projeção e ponto do plano exibido na origem da tela:
+        Zoom = 1
+        Deslocamento = (0, 0)
+        # Cálculo e impressão dos segmentos tridimensionais projetados no plano bidimensional:
+        Render = True
+        Proximo_quadro = perf_counter() + Orcamento
+        while Render:
+            Inicio_quadro = perf_counter()
+            perfil.iniciar_quadro()
+            Falhas = Cache.falhas
+            # Informações de depuração e instruções, exibidas abaixo do gráfico:
+            Rodape = []
+            if Debug:
+                Rot_1_d = Rotacao_1*180
+                Rot_2_d = Rotacao_2*180
+                Rodape += ("Rotação em torno do eixo 'z': %.2fº;\nRotação em torno do eixo 'i': %.2fº;\n"
+                           "Bytes escritos no último quadro: %d;\n"
+                           "Cache de quadros: %d acertos, %d falhas, %d descartes, %d quadros, %.1f de %.1f MiB;\n"
+                           "Giro automático: %s, %.1f ms no último quadro (orçamento de %.1f ms), "
+                           "%d quadros perdidos;\n"
+                           "Zoom: %.2fx, com o ponto (%.2f, %.2f) do plano na origem da tela.\n"
+                           % (Rot_1_d, Rot_2_d, Tela_terminal.bytes_ultimo_quadro, Cache.acertos, Cache.falhas,
+                              Cache.descartes, len(Cache.quadros), Cache.bytes / 2 ** 20, Cache.limite_bytes / 2 ** 20,
+                              "ligado" if Giro else "desligado", 1000 * Tempo_quadro, 1000 * Orcamento,
+                              Quadros_perdidos, Zoom, *Deslocamento)).split("\n")
+                Rodape += perfil.linhas()
+            Rodape += centralize_lines("[W/A/S/D] -> Movimento | [+/-] -> Zoom | [I/J/K/L] -> Deslocar | "
+                                       "[0] -> Centralizar | [B] -> Braille/blocos\n"
+                                       "[G] -> Girar | [H] -> Profundidade | [R] -> Reposicionar | [P] -> Imprimir | "
+                                       "[Q] -> Sair", False, get_terminal_size().columns if Modo != "ascii" else None)
+            Linhas = []
+            if Print:
+                # Imagem com 'Scale' pixels por unidade do plano de projeção, rasterizada sem alterar a cena:
+                Imagem = renderizar_imagem(Cena, Rotacao_1, Rotacao_2, (X_max - X_min) * Scale, (Y_max - Y_min) * Scale,
+                                           profundidade=Profundidade, zoom=Zoom, deslocamento=Deslocamento)
+                Imagem.save("my.png")
+                Imagem.show()
             else:
-                Register = True
+                if Modo == "ascii":
+                    Tamanho = None
+                else:
+                    # Gráfico do tamanho do terminal, descontadas a coluna dos valores de 'y' e as linhas do rodapé:
+                    Terminal = get_terminal_size()
+                    Tamanho = (max(Terminal.columns - 8, 1), max(Terminal.lines - len(Rodape) - 2, 1))
+                # Impressão do plano de projeção, renderizado apenas se ainda não estiver na cache de quadros:
+                String_interface = Cache.obter(Cena, Rotacao_1, Rotacao_2,
+                                               lambda rotacao_1, rotacao_2: gerar_quadro(rotacao_1, rotacao_2, perfil),
+                                               (Modo, Tamanho, Profundidade, Zoom, Deslocamento))
+                if Modo == "ascii":
+                    Linhas += centralize_lines(String_interface, True, 130)
+                else:
+                    Linhas += String_interface.split("\n")
+            Linhas += Rodape
+            Inicio_saida = perf_counter()
+            Tela_terminal.desenhar(Linhas)
+            perfil.registrar("saida", Inicio_saida, perf_counter())
+            perfil.contar(bytes=Tela_terminal.bytes_ultimo_quadro)
+            perfil.concluir_quadro(cena=Cena["nome"], rotacao_1=Rotacao_1, rotacao_2=Rotacao_2,
+                                   cache="falha" if Cache.falhas > Falhas else "acerto")
+            Tempo_quadro = perf_counter() - Inicio_quadro
+            # Modificações geradas pela interação do usuário:
+            if not Print: Register = True
+            Print = False
+            while Register:
+                Register = False
+                if Giro:
+                    # Quadros cujo prazo já passou são descartados, avançando a rotação como se tivessem sido exibidos:
+                    Perdidos = int((perf_counter() - Proximo_quadro) / Orcamento)
+                    if Perdidos > 0:
+                        Quadros_perdidos += Perdidos
+                        Proximo_quadro += Perdidos * Orcamento
+                        Rotacao_1 += Perdidos * Speed
+                if pre_carregar and Giro:
+                    # No giro automático, apenas o próximo quadro é pré-carregado, sem consumir o orçamento com
+                    # vizinhos que o giro não exibirá:
+                    Ocioso = lambda: Cache.pre_carregar(Cena, [(Rotacao_1 + Speed, Rotacao_2)], pre_carregar_quadro,
+                                                        (Modo, Tamanho, Profundidade, Zoom, Deslocamento))
+                elif pre_carregar:
+                    Ocioso = lambda: Cache.pre_carregar_vizinhos(Cena, Rotacao_1, Rotacao_2, Speed,
+                                                                 pre_carregar_quadro,
+                                                                 (Modo, Tamanho, Profundidade, Zoom, Deslocamento))
+                else:
+                    Ocioso = None
+                # Todas as teclas digitadas desde o último quadro, sem repetições, de modo que uma tecla mantida
+                # pressionada avance um único passo por quadro:
+                Buttons = set(teclado.aguardar(Proximo_quadro if Giro else None, Ocioso).lower())
+                # Após uma mudança de tamanho do terminal, o quadro é redesenhado por completo, já no novo tamanho:
+                Redimensionado, teclado.redimensionado = teclado.redimensionado, False
+                if Redimensionado:
+                    Tela_terminal.redesenhar()
+                if Giro and perf_counter() >= Proximo_quadro:
+                    Rotacao_1 += Speed
+                    Proximo_quadro += Orcamento
+                elif not Buttons & set("wasd+=-ijkl0bghzprq") and not Redimensionado:
+                    Register = True
+                    continue
+                Rotacao_1 += Speed * (("d" in Buttons) - ("a" in Buttons))
+                Rotacao_2 += Speed * (("s" in Buttons) - ("w" in Buttons))
+                # Cada passo de deslocamento move a imagem em quatro colunas ou duas linhas, qualquer que seja o zoom:
+                Zoom *= 1.25 ** (bool(Buttons & set("+=")) - ("-" in Buttons))
+                Deslocamento = (Deslocamento[0] + 2 / Zoom * (("l" in Buttons) - ("j" in Buttons)),
+                                Deslocamento[1] + 2 / Zoom * (("i" in Buttons) - ("k" in Buttons)))
+                if "0" in Buttons:
+                    Zoom = 1
+                    Deslocamento = (0, 0)
+                if "b" in Buttons:
+                    Modo = Modos[(Modos.index(Modo) + 1) % len(Modos)]
+                if "g" in Buttons:
+                    Giro = not Giro
+                    Proximo_quadro = perf_counter() + Orcamento
+                if "h" in Buttons:
+                    Profundidade = not Profundidade
+                if "z" in Buttons:
+                    Debug = not Debug
+                if "p" in Buttons:
+                    Print = True
+                if "r" in Buttons:
+                    # Reinicia a mesma cena, com a rotação e o enquadramento iniciais, sem uma nova seleção:
+                    Render = False
+                if "q" in Buttons:
+                    Render = False
+                    Selection = True
+                    Start = True
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Simulação e visualização de objetos geométricos 3D na linha de comando.")
+    parser.add_argument("modelos", nargs="*", help="modelos 3D (OBJ, STL ou PLY) exibidos no menu inicial")
+    parser.add_argument("--cache-mb", type=float, default=64, help="limite de memória da cache de quadros, em MiB")
+    parser.add_argument("--sem-pre-carregamento", action="store_true",
+                        help="não renderiza os quadros vizinhos enquanto aguarda uma tecla")
+    parser.add_argument("--rastro", help="arquivo em que os tempos de cada quadro da sessão são gravados, no formato de "
+                                         "eventos do Chrome ou, se terminar em '.jsonl', em JSON lines")
+    parser.add_argument("--modo", choices=("ascii",) + tuple(SUBCELULAS), default="ascii",
+                        help="impressão inicial: um caractere por célula ou vários subpixels por caractere")
+    parser.add_argument("--fps", type=float, default=30, help="quadros por segundo do giro automático")
+    argumentos = parser.parse_args()
+    main(argumentos.modelos, int(argumentos.cache_mb * 2 ** 20), not argumentos.sem_pre_carregamento,
+         argumentos.fps, argumentos.rastro, argumentos.modo)
@@ -0,0 +1,273 @@
+import re
+from os import path
+
+import numpy as np
+
+# Tipos de dados dos arquivos PLY e seus equivalentes no NumPy (sem a ordem dos bytes, definida pelo formato):
+TIPOS_PLY = {"char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1", "short": "i2", "int16": "i2",
+             "ushort": "u2", "uint16": "u2", "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+             "float": "f4", "float32": "f4", "double": "f8", "float64": "f8"}
+# Registro de cada triângulo de um arquivo STL binário, após o cabeçalho de 80 bytes e a contagem de triângulos:
+TRIANGULO_STL = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("atributo", "<u2")])
+
+
+def arestas_unicas(pares):
+    """Recebe um array (A, 2) de pares de índices de vértices e retorna as arestas sem repetição, independentemente da
+    ordem das extremidades, descartando arestas degeneradas (de um vértice para ele mesmo)."""
+    pares = np.sort(np.asarray(pares, dtype=np.int64).reshape(-1, 2), axis=1)
+    pares = pares[pares[:, 0] != pares[:, 1]]
+    return np.unique(pares, axis=0)
+
+
+def arestas_das_faces(faces):
+    """Recebe um array (F, k) com os índices dos vértices de F faces de k lados e retorna os pares de índices de todos
+    os lados, incluindo os repetidos entre faces vizinhas."""
+    faces = np.asarray(faces, dtype=np.int64)
+    return np.stack((faces, np.roll(faces, -1, axis=1)), axis=-1).reshape(-1, 2)
+
+
+def arestas_dos_poligonos(poligonos):
+    """Recebe uma lista de faces com quantidades variadas de lados, cada uma dada pelos índices de seus vértices, e
+    retorna os pares de índices de todos os lados, processando de uma só vez as faces com o mesmo número de lados."""
+    por_tamanho = {}
+    for indices in poligonos:
+        if len(indices):
+            por_tamanho.setdefault(len(indices), []).append(indices)
+    return np.concatenate([np.zeros((0, 2), dtype=np.int64)] + [arestas_das_faces(f) for f in por_tamanho.values()])
+
+
+def vertices_sem_repeticao(vertices):
+    """Recebe um array (P, 3) de vértices, possivelmente repetidos, e retorna os vértices únicos e o índice de cada
+    vértice original entre eles."""
+    unicos, indices = np.unique(np.asarray(vertices, dtype=float), axis=0, return_inverse=True)
+    return unicos, indices.reshape(-1)
+
+
+def carregar_obj(caminho):
+    """Lê um arquivo Wavefront OBJ, retornando seus vértices e as arestas de suas faces ('f') e linhas ('l')."""
+    vertices = []
+    faces = []
+    pares = []
+    with open(caminho, encoding="utf-8", errors="replace") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if not partes:
+                continue
+            if partes[0] == "v":
+                vertices.append(partes[1:4])
+            elif partes[0] in ("f", "l"):
+                # Índices começam em 1, podem ser negativos (relativos ao fim) e vir acompanhados de '/vt/vn':
+                indices = [int(p.split("/")[0]) for p in partes[1:]]
+                indices = [i - 1 if i > 0 else len(vertices) + i for i in indices]
+                if partes[0] == "f":
+                    faces.append(indices)
+                else:
+                    pares += zip(indices[:-1], indices[1:])
+    pares = np.concatenate((np.array(pares, dtype=np.int64).reshape(-1, 2), arestas_dos_poligonos(faces)))
+    return np.array(vertices, dtype=float).reshape(-1, 3), arestas_unicas(pares)
+
+
+def carregar_stl(caminho):
+    """Lê um arquivo STL, binário ou ASCII, retornando seus vértices sem repetição e as arestas de seus triângulos.
+    Arquivos binários são mapeados em memória, em vez de lidos triângulo por triângulo."""
+    tamanho = path.getsize(caminho)
+    with open(caminho, "rb") as arquivo:
+        cabecalho = arquivo.read(84)
+    if len(cabecalho) == 84:
+        quantidade = int(np.frombuffer(cabecalho[80:84], dtype="<u4")[0])
+        binario = tamanho == 84 + quantidade * TRIANGULO_STL.itemsize
+    else:
+        binario = False
+    if binario:
+        triangulos = np.memmap(caminho, dtype=TRIANGULO_STL, mode="r", offset=84, shape=(quantidade,))
+        vertices = triangulos["vertices"].reshape(-1, 3)
+    else:
+        with open(caminho, encoding="utf-8", errors="replace") as arquivo:
+            texto = arquivo.read()
+        if not texto.lstrip().startswith("solid"):
+            raise ValueError("Arquivo STL inválido: %s" % caminho)
+        numeros = re.findall(r"vertex\s+(\S+)\s+(\S+)\s+(\S+)", texto)
+        vertices = np.array(numeros, dtype=float).reshape(-1, 3)
+    unicos, indices = vertices_sem_repeticao(vertices)
+    return unicos, arestas_unicas(arestas_das_faces(indices.reshape(-1, 3)))
+
+
+def _tipo_ply(tipo, arquivo):
+    """Retorna o tipo do NumPy equivalente a um tipo de dado do cabeçalho PLY."""
+    if tipo not in TIPOS_PLY:
+        raise ValueError("Tipo PLY '%s' não suportado: %s" % (tipo, arquivo.name))
+    return TIPOS_PLY[tipo]
+
+
+def _cabecalho_ply(arquivo):
+    """Lê o cabeçalho de um arquivo PLY aberto em modo binário, retornando o formato e a lista de elementos, cada um
+    descrito por (nome, quantidade, propriedades). Propriedades escalares são (nome, tipo) e listas são
+    (nome, tipo da contagem, tipo dos itens)."""
+    if arquivo.readline().strip() != b"ply":
+        raise ValueError("Arquivo PLY inválido: %s" % arquivo.name)
+    formato = None
+    elementos = []
+    for linha in arquivo:
+        partes = linha.decode("ascii", errors="replace").split()
+        if not partes or partes[0] in ("comment", "obj_info"):
+            continue
+        if partes[0] == "end_header":
+            return formato, elementos
+        if partes[0] == "format":
+            formato = partes[1]
+        elif partes[0] == "element":
+            elementos.append((partes[1], int(partes[2]), []))
+        elif partes[0] == "property" and partes[1] == "list":
+            elementos[-1][2].append((partes[4], _tipo_ply(partes[2], arquivo), _tipo_ply(partes[3], arquivo)))
+        elif partes[0] == "property":
+            elementos[-1][2].append((partes[2], _tipo_ply(partes[1], arquivo)))
+    raise ValueError("Cabeçalho PLY incompleto: %s" % arquivo.name)
+
+
+def _registros_ply(quantidade, propriedades, ler_escalar, ler_lista):
+    """Lê 'quantidade' registros de um elemento PLY propriedade por propriedade, na ordem do cabeçalho, com as funções
+    de leitura de um valor escalar e de uma lista dadas, retornando um dicionário com os valores de cada propriedade:
+    um array, para as escalares, ou uma lista de arrays, para as de lista."""
+    valores = {propriedade[0]: [] for propriedade in propriedades}
+    for _ in range(quantidade):
+        for propriedade in propriedades:
+            if len(propriedade) == 2:
+                valores[propriedade[0]].append(ler_escalar(propriedade))
+            else:
+                valores[propriedade[0]].append(ler_lista(propriedade))
+    return {p[0]: np.array(valores[p[0]]) if len(p) == 2 else valores[p[0]] for p in propriedades}
+
+
+def _elemento_ascii_ply(linhas, propriedades, caminho):
+    """Lê as linhas de um elemento PLY ASCII, retornando um dicionário com os valores de cada propriedade. Elementos
+    sem listas são lidos em uma única tabela."""
+    if all(len(p) == 2 for p in propriedades):
+        tabela = np.array([l.split()[:len(propriedades)] for l in linhas], dtype=float).reshape(-1, len(propriedades))
+        return {p[0]: tabela[:, n] for n, p in enumerate(propriedades)}
+    partes = iter(" ".join(linhas).split())
+
+    def proxima():
+        try:
+            return next(partes)
+        except StopIteration:
+            raise ValueError("Arquivo PLY incompleto: %s" % caminho) from None
+
+    def ler_lista(propriedade):
+        return np.array([proxima() for _ in range(int(proxima()))], dtype=np.int64)
+
+    return _registros_ply(len(linhas), propriedades, lambda propriedade: float(proxima()), ler_lista)
+
+
+def _elemento_binario_ply(dados, inicio, quantidade, propriedades, ordem):
+    """Lê 'quantidade' registros binários de um elemento PLY a partir de 'inicio', retornando um dicionário com os
+    valores de cada propriedade e a posição seguinte."""
+    campos = []
+    posicao = inicio
+    for propriedade in propriedades:
+        if len(propriedade) == 2:
+            campos.append((propriedade[0], ordem + propriedade[1]))
+            posicao += np.dtype(propriedade[1]).itemsize
+        else:
+            nome, tipo_contagem, tipo_item = propriedade
+            contagem = np.dtype(ordem + tipo_contagem)
+            tamanho = int(np.frombuffer(dados, dtype=contagem, count=1, offset=posicao)[0]) if quantidade else 0
+            campos += [("contagem_" + nome, contagem), (nome, ordem + tipo_item, (tamanho,))]
+            posicao += contagem.itemsize + tamanho * np.dtype(tipo_item).itemsize
+    # Leitura em um único array estruturado, cujo formato é dado pelo primeiro registro, quando todas as listas têm o
+    # mesmo tamanho, como nas malhas de triângulos; caso contrário, registro por registro:
+    registro = np.dtype(campos)
+    if inicio + quantidade * registro.itemsize <= len(dados):
+        tabela = np.frombuffer(dados, dtype=registro, count=quantidade, offset=inicio)
+        listas = [p[0] for p in propriedades if len(p) == 3]
+        if all(np.all(tabela["contagem_" + nome] == tabela.dtype[nome].shape[0]) for nome in listas):
+            valores = {p[0]: tabela[p[0]].reshape(quantidade, tabela.dtype[p[0]].shape[0]) if len(p) == 3
+                       else tabela[p[0]] for p in propriedades}
+            return valores, inicio + quantidade * registro.itemsize
+
+    def ler_escalar(propriedade):
+        nonlocal inicio
+        tipo = np.dtype(ordem + propriedade[1])
+        valor = np.frombuffer(dados, dtype=tipo, count=1, offset=inicio)[0]
+        inicio += tipo.itemsize
+        return valor
+
+    def ler_lista(propriedade):
+        nonlocal inicio
+        contagem, item = np.dtype(ordem + propriedade[1]), np.dtype(ordem + propriedade[2])
+        tamanho = int(np.frombuffer(dados, dtype=contagem, count=1, offset=inicio)[0])
+        itens = np.frombuffer(dados, dtype=item, count=tamanho, offset=inicio + contagem.itemsize)
+        inicio += contagem.itemsize + tamanho * item.itemsize
+        return itens
+
+    valores = _registros_ply(quantidade, propriedades, ler_escalar, ler_lista)
+    return valores, inicio
+
+
+def carregar_ply(caminho):
+    """Lê um arquivo PLY, ASCII ou binário, retornando seus vértices e as arestas de suas faces e de seu elemento
+    'edge', quando houver. Em arquivos binários, os dados são mapeados em memória. Propriedades adicionais, como cores
+    e normais, são lidas e descartadas."""
+    with open(caminho, "rb") as arquivo:
+        formato, elementos = _cabecalho_ply(arquivo)
+        inicio = arquivo.tell()
+    valores = {}
+    if formato == "ascii":
+        with open(caminho, "rb") as arquivo:
+            arquivo.seek(inicio)
+            linhas = arquivo.read().decode("ascii", errors="replace").splitlines()
+        linhas = [l for l in linhas if l.strip()]
+        for nome, quantidade, propriedades in elementos:
+            itens, linhas = linhas[:quantidade], linhas[quantidade:]
+            if len(itens) < quantidade:
+                raise ValueError("Arquivo PLY incompleto: %s" % caminho)
+            valores[nome] = _elemento_ascii_ply(itens, propriedades, caminho)
+    elif formato in ("binary_little_endian", "binary_big_endian"):
+        ordem = "<" if formato == "binary_little_endian" else ">"
+        dados = np.memmap(caminho, dtype=np.uint8, mode="r")
+        for nome, quantidade, propriedades in elementos:
+            valores[nome], inicio = _elemento_binario_ply(dados, inicio, quantidade, propriedades, ordem)
+    else:
+        raise ValueError("Formato PLY '%s' não suportado: %s" % (formato, caminho))
+    if "vertex" not in valores:
+        raise ValueError("Arquivo PLY sem vértices: %s" % caminho)
+    if not all(c in valores["vertex"] for c in "xyz"):
+        raise ValueError("Vértices PLY sem as coordenadas x, y e z: %s" % caminho)
+    vertices = np.stack([valores["vertex"][c] for c in "xyz"], axis=1).astype(float)
+    pares = [np.zeros((0, 2), dtype=np.int64)]
+    # Índices das faces, na primeira propriedade de lista do elemento, qualquer que seja o seu nome:
+    listas = [v for v in valores.get("face", {}).values() if not isinstance(v, np.ndarray) or v.ndim == 2]
+    if listas and isinstance(listas[0], np.ndarray):
+        pares.append(arestas_das_faces(listas[0]))
+    elif listas:
+        pares.append(arestas_dos_poligonos(listas[0]))
+    if "edge" in valores:
+        if not all(c in valores["edge"] for c in ("vertex1", "vertex2")):
+            raise ValueError("Arestas PLY sem as propriedades vertex1 e vertex2: %s" % caminho)
+        pares.append(np.stack((valores["edge"]["vertex1"], valores["edge"]["vertex2"]), axis=1))
+    return vertices, arestas_unicas(np.concatenate(pares))
+
+
+# Leitores de cada formato de arquivo suportado, pela extensão:
+LEITORES = {".obj": carregar_obj, ".stl": carregar_stl, ".ply": carregar_ply}
+
+
+def carregar_malha(caminho, raio=18):
+    """Lê um modelo 3D (OBJ, STL ou PLY) e retorna a sua cena, com os vértices em um array contíguo (V, 3) e as arestas,
+    sem repetição, em um array (A, 2) de índices. O modelo é centralizado na origem e redimensionado para que caiba em
+    uma esfera de raio 'raio', dentro dos limites padrão do plano de projeção."""
+    extensao = path.splitext(caminho)[1].lower()
+    if extensao not in LEITORES:
+        raise ValueError("Formato de arquivo não suportado: %s" % caminho)
+    vertices, arestas = LEITORES[extensao](caminho)
+    if not len(arestas):
+        raise ValueError("O modelo não possui arestas: %s" % caminho)
+    if arestas.min() < 0 or arestas.max() >= len(vertices):
+        raise ValueError("O modelo possui arestas com índices de vértices inexistentes: %s" % caminho)
+    vertices = np.ascontiguousarray(vertices, dtype=float)
+    centro = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    vertices -= centro
+    maior_distancia = np.sqrt((vertices ** 2).sum(axis=1)).max()
+    if maior_distancia > 0:
+        vertices *= raio / maior_distancia
+    return {"nome": path.basename(caminho), "vertices": vertices, "arestas": np.ascontiguousarray(arestas),
+            "rotacao_1": .31, "rotacao_2": .15, "limites": (-20, 20, -20, 20)}
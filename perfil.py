@@ -0,0 +1,125 @@
+import json
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+# Etapas do pipeline de impressão, na ordem em que são executadas a cada quadro:
+ETAPAS = ("projecao", "recorte", "amostragem", "rasterizacao", "string", "saida")
+# Rótulos exibidos no modo de depuração para as contagens cujos nomes, usados em 'contar', não têm acentos:
+ROTULOS = {"visiveis": "segmentos visíveis"}
+
+
+class Perfil:
+    """Registra a duração de cada etapa dos quadros, mantendo os últimos 'janela' quadros para o cálculo de
+    percentis, e, se 'rastro' for dado, grava a sessão em JSON lines ('.jsonl') ou no formato de eventos do Chrome."""
+
+    def __init__(self, janela=120, rastro=None):
+        self.historico = {etapa: deque(maxlen=janela) for etapa in ETAPAS}
+        self.inicio_sessao = perf_counter()
+        self.quadros = 0
+        self.inicio_quadro = None
+        self.etapas = []
+        self.contagens = {}
+        self.ultimo_quadro = {}
+        self.ultimas_contagens = {}
+        self.pre_carregados = deque(maxlen=janela)
+        self.arquivo = None
+        if rastro is not None:
+            self.arquivo = open(rastro, "w")
+            self.chrome = not rastro.lower().endswith(".jsonl")
+            if self.chrome:
+                self.arquivo.write("[\n")
+
+    def iniciar_quadro(self):
+        self.inicio_quadro = perf_counter()
+        self.etapas = []
+        self.contagens = {}
+
+    def registrar(self, etapa, inicio, fim):
+        """Registra uma etapa do quadro atual, executada entre os instantes 'inicio' e 'fim' de 'perf_counter()'."""
+        self.etapas.append((etapa, inicio, fim))
+
+    def registrar_sequencia(self, instantes, etapas=ETAPAS):
+        """Registra etapas consecutivas do quadro atual, na ordem de 'etapas', cada uma executada entre um instante de
+        'instantes' e o seguinte."""
+        for etapa, inicio, fim in zip(etapas, instantes, instantes[1:]):
+            self.registrar(etapa, inicio, fim)
+
+    def contar(self, **contagens):
+        """Registra contagens do quadro atual, como a quantidade de segmentos e de pontos amostrados."""
+        self.contagens.update(contagens)
+
+    def concluir_quadro(self, pre_carregado=False, **dados):
+        """Encerra o quadro atual, guardando a duração de cada etapa executada e gravando-o no rastro, junto de 'dados'.
+        Etapas que não foram executadas, como as de um quadro obtido da cache, não entram nos percentis. Com
+        'pre_carregado', o quadro é registrado como renderizado antecipadamente, sem ter sido impresso."""
+        fim = perf_counter()
+        duracoes = {}
+        for etapa, inicio, fim_etapa in self.etapas:
+            duracoes[etapa] = duracoes.get(etapa, 0) + fim_etapa - inicio
+        for etapa, duracao in duracoes.items():
+            self.historico[etapa].append(duracao)
+        self.pre_carregados.append(pre_carregado)
+        if not pre_carregado:
+            self.ultimo_quadro = duracoes
+            self.ultimas_contagens = self.contagens
+        if self.arquivo is not None:
+            self._gravar(fim, duracoes, pre_carregado, dados)
+        self.quadros += 1
+
+    def percentis(self, etapa, percentis=(50, 95, 99)):
+        """Retorna os percentis dados da duração de uma etapa nos últimos quadros, em segundos, ou None se a etapa não
+        tiver sido executada em nenhum deles."""
+        if not self.historico[etapa]:
+            return None
+        return np.percentile(self.historico[etapa], percentis)
+
+    def linhas(self):
+        """Retorna as linhas da tabela de tempos exibida no modo de depuração."""
+        linhas = ["%-14s %9s %9s %9s %9s  (ms, últimos %d quadros, %d deles pré-carregados)"
+                  % ("etapa", "último", "p50", "p95", "p99", len(self.pre_carregados), sum(self.pre_carregados))]
+        for etapa in ETAPAS:
+            ultimo = "%9.3f" % (1000 * self.ultimo_quadro[etapa]) if etapa in self.ultimo_quadro else "%9s" % "-"
+            percentis = self.percentis(etapa)
+            if percentis is None:
+                linhas.append("%-14s %s %9s %9s %9s" % (etapa, ultimo, "-", "-", "-"))
+            else:
+                linhas.append("%-14s %s %9.3f %9.3f %9.3f" % ((etapa, ultimo) + tuple(1000 * percentis)))
+        if self.ultimas_contagens:
+            linhas.append("Último quadro: " + ", ".join("%d %s" % (quantidade, ROTULOS.get(nome, nome))
+                                                         for nome, quantidade in self.ultimas_contagens.items()) + ".")
+        return linhas
+
+    def fechar(self):
+        if self.arquivo is not None:
+            if self.chrome:
+                self.arquivo.write("\n]\n")
+            self.arquivo.close()
+            self.arquivo = None
+
+    def _microssegundos(self, instante):
+        return round(1e6 * (instante - self.inicio_sessao), 3)
+
+    def _gravar(self, fim, duracoes, pre_carregado, dados):
+        if not self.chrome:
+            registro = {"quadro": self.quadros, "pre_carregado": pre_carregado,
+                        "inicio_s": self.inicio_quadro - self.inicio_sessao,
+                        "total_ms": 1000 * (fim - self.inicio_quadro),
+                        "etapas_ms": {etapa: 1000 * duracao for etapa, duracao in duracoes.items()}}
+            registro.update(self.contagens)
+            registro.update(dados)
+            self.arquivo.write(json.dumps(registro) + "\n")
+            return
+        # Quadros impressos na trilha 1 e quadros pré-carregados na trilha 2:
+        trilha = 2 if pre_carregado else 1
+        nome = "pre_carga" if pre_carregado else "quadro"
+        eventos = [{"name": nome, "ph": "X", "pid": 1, "tid": trilha, "ts": self._microssegundos(self.inicio_quadro),
+                    "dur": round(1e6 * (fim - self.inicio_quadro), 3), "args": dict(dados, quadro=self.quadros)}]
+        eventos += [{"name": etapa, "ph": "X", "pid": 1, "tid": trilha, "ts": self._microssegundos(inicio),
+                     "dur": round(1e6 * (fim_etapa - inicio), 3)} for etapa, inicio, fim_etapa in self.etapas]
+        if self.contagens:
+            eventos.append({"name": "contagens", "ph": "C", "pid": 1, "ts": self._microssegundos(self.inicio_quadro),
+                            "args": self.contagens})
+        # Separadores antes de cada evento, exceto do primeiro, para que o arquivo final seja um array JSON válido:
+        self.arquivo.write(("" if self.quadros == 0 else ",\n") + ",\n".join(json.dumps(e) for e in eventos))
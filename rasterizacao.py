@@ -0,0 +1,330 @@
+import numpy as np
+from math import pi
+from time import perf_counter
+
+from geometria import projecao_da_cena, raio_da_cena
+
+# Caracteres utilizados no modo de profundidade, do ponto mais próximo ao mais distante do observador:
+RAMPA_DE_PROFUNDIDADE = "@#%*+=-:."
+# Subpixels (colunas, linhas) de cada caractere nos modos de impressão em subcélulas:
+SUBCELULAS = {"braille": (2, 4), "blocos": (1, 2)}
+# Bit de cada ponto de um caractere Braille, por linha e coluna, somado ao código U+2800 do caractere vazio:
+PONTOS_BRAILLE = np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]])
+# Caracteres de meio bloco, pela ocupação das metades superior (1) e inferior (2) da célula:
+MEIOS_BLOCOS = np.array([ord(c) for c in " ▀▄█"])
+# Bits dos códigos de região de Cohen-Sutherland, que indicam de que lados da janela de recorte um ponto está:
+ESQUERDA, DIREITA, ABAIXO, ACIMA = 1, 2, 4, 8
+
+
+def coordenadas_continuas_de_segmento_bidimensional(segmento, quantidade):
+    """A partir das coordenadas das extremidades de um segmento bidimensional, retorna uma quantidade de
+    coordenadas que correspondem com os pontos entre as próprias extremidades."""
+    lista_coordenadas = []
+    coordenadas_x = np.linspace(segmento[0][0], segmento[1][0], quantidade)
+    coordenadas_y = np.linspace(segmento[0][1], segmento[1][1], quantidade)
+    for c in range(0, quantidade):
+        lista_coordenadas.append([coordenadas_x[c], coordenadas_y[c]])
+    return lista_coordenadas
+
+
+def coordenadas_continuas_dos_segmentos(segmentos, quantidade):
+    """Versão vetorizada de 'coordenadas_continuas_de_segmento_bidimensional': a partir de um array (N, 2, 2) com as
+    extremidades de N segmentos bidimensionais, retorna um array (N * quantidade, 2) com os pontos de todos eles."""
+    segmentos = np.asarray(segmentos, dtype=float)
+    inicio, fim = segmentos[:, None, 0], segmentos[:, None, 1]
+    indices = np.arange(quantidade, dtype=float)[:, None]
+    if quantidade > 1:
+        # Mesma aritmética de 'np.linspace' para cada segmento, garantindo pontos idênticos aos da versão escalar:
+        delta = fim - inicio
+        passo = delta / (quantidade - 1)
+        coordenadas = np.where(passo == 0, indices / (quantidade - 1) * delta, indices * passo) + inicio
+        coordenadas[:, -1] = fim[:, 0]
+    else:
+        coordenadas = indices * (fim - inicio) + inicio
+    return coordenadas.reshape(-1, 2)
+
+
+def codigos_de_regiao(pontos, x_min, x_max, y_min, y_max):
+    """Retorna o código de região de Cohen-Sutherland de cada ponto de um array (..., 2 ou mais): zero dentro da janela
+    [x_min, x_max] x [y_min, y_max] e, fora dela, a combinação dos bits dos lados ultrapassados."""
+    x, y = pontos[..., 0], pontos[..., 1]
+    return (ESQUERDA * (x < x_min) | DIREITA * (x > x_max) | ABAIXO * (y < y_min) | ACIMA * (y > y_max)).astype(np.int8)
+
+
+def recortar_segmentos(segmentos, x_min, x_max, y_min, y_max):
+    """Recorta um array (N, 2, 2 ou mais) de segmentos projetados pela janela [x_min, x_max] x [y_min, y_max], com o
+    algoritmo de Cohen-Sutherland executado de uma só vez sobre todos os segmentos, e retorna apenas os trechos
+    visíveis."""
+    segmentos = np.asarray(segmentos, dtype=float)
+    segmentos = segmentos.reshape(-1, 2, segmentos.shape[-1] if segmentos.ndim == 3 else 2)
+    codigos = codigos_de_regiao(segmentos, x_min, x_max, y_min, y_max)
+    if not codigos.any():
+        return segmentos
+    visiveis = (codigos[:, 0] & codigos[:, 1]) == 0
+    segmentos, codigos = segmentos[visiveis], codigos[visiveis]
+    pendentes = np.flatnonzero(codigos.any(axis=1))
+    if not len(pendentes):
+        return segmentos
+    segmentos = segmentos.copy()
+    aceitos = np.ones(len(segmentos), dtype=bool)
+    while len(pendentes):
+        codigos_pendentes = codigos[pendentes]
+        # Extremidade externa movida nesta passagem (a inicial, se estiver fora) e a outra extremidade:
+        externa = (codigos_pendentes[:, 0] == 0).astype(np.int64)
+        codigo = codigos_pendentes[np.arange(len(pendentes)), externa]
+        ponto = segmentos[pendentes, externa]
+        outro = segmentos[pendentes, 1 - externa]
+        # Borda ultrapassada, na ordem de prioridade de Cohen-Sutherland, e o eixo e o valor correspondentes:
+        eixo = np.where(codigo & (ACIMA | ABAIXO), 1, 0)
+        bordas = [(codigo & ACIMA) != 0, (codigo & ABAIXO) != 0, (codigo & DIREITA) != 0]
+        borda = np.select(bordas, [y_max, y_min, x_max], x_min).astype(float)
+        linhas = np.arange(len(pendentes))
+        fracao = (borda - ponto[linhas, eixo]) / (outro[linhas, eixo] - ponto[linhas, eixo])
+        ponto = ponto + fracao[:, None] * (outro - ponto)
+        ponto[linhas, eixo] = borda
+        segmentos[pendentes, externa] = ponto
+        codigos[pendentes, externa] = codigos_de_regiao(ponto, x_min, x_max, y_min, y_max)
+        codigos_pendentes = codigos[pendentes]
+        rejeitados = (codigos_pendentes[:, 0] & codigos_pendentes[:, 1]) != 0
+        aceitos[pendentes[rejeitados]] = False
+        pendentes = pendentes[~rejeitados & codigos_pendentes.any(axis=1)]
+    return segmentos[aceitos]
+
+
+def coordenadas_rasterizadas_dos_segmentos(segmentos, passo_x, passo_y):
+    """Rasteriza, no estilo DDA, um array (N, 2, 2) de segmentos em uma grade de resolução 'passo_x' por 'passo_y',
+    retornando um array (P, 2) com um ponto por célula percorrida ao longo do eixo dominante de cada segmento."""
+    segmentos = np.asarray(segmentos, dtype=float)
+    segmentos = segmentos.reshape(-1, 2, segmentos.shape[-1] if segmentos.ndim == 3 else 2)
+    inicio = segmentos[:, 0]
+    delta = segmentos[:, 1] - inicio
+    passos = np.ceil(np.max(np.abs(delta[:, :2]) / (passo_x, passo_y), axis=1)).astype(np.int64)
+    quantidades = passos + 1
+    # Índice do segmento de origem e posição de cada ponto dentro do próprio segmento:
+    origem = np.repeat(np.arange(len(segmentos)), quantidades)
+    posicao = np.arange(quantidades.sum()) - np.repeat(np.cumsum(quantidades) - quantidades, quantidades)
+    fracao = posicao / np.maximum(passos, 1)[origem]
+    return inicio[origem] + fracao[:, None] * delta[origem]
+
+
+def grade_de_impressao(x_min, x_max, y_min, y_max):
+    """Retorna os valores de 'x' de cada coluna e de 'y' de cada linha da tela de impressão, na ordem em que são
+    impressos: 'x' cresce de meio em meio a partir de 'x_min' e 'y' decresce de um em um a partir de 'y_max'."""
+    colunas = []
+    x = x_min
+    while x <= x_max:
+        colunas.append(x)
+        x += .5
+    linhas = []
+    y = y_max
+    while y >= y_min:
+        linhas.append(y)
+        y -= 1
+    return np.array(colunas, dtype=float), linhas
+
+
+def celulas_dos_pontos(colunas, linhas, coordenadas):
+    """Retorna, para cada par (ponto, célula) em que um ponto de um array de coordenadas (P, 2 ou mais) está próximo de
+    uma célula da grade de impressão, o índice da linha, o da coluna e o do ponto. Uma célula (x, y) é próxima de um
+    ponto quando ele dista, com um grau de incerteza, no máximo meia unidade de 'x' e de 'y'."""
+    incerteza = .5
+    valores_y = np.array(linhas, dtype=float)
+    # Índices candidatos de coluna e de linha, vizinhos à célula mais próxima de cada ponto:
+    base_x = np.floor((coordenadas[:, 0] - colunas[0]) / .5).astype(np.int64)
+    base_y = np.floor(valores_y[0] - coordenadas[:, 1]).astype(np.int64)
+    indices_x = np.clip(base_x[:, None] + np.arange(-2, 3), 0, len(colunas) - 1)
+    indices_y = np.clip(base_y[:, None] + np.arange(-1, 3), 0, len(linhas) - 1)
+    # Mesmo critério de proximidade da antiga verificação ponto a ponto:
+    proximos_x = np.abs(coordenadas[:, 0, None] - colunas[indices_x]) <= incerteza
+    proximos_y = np.abs(coordenadas[:, 1, None] - valores_y[indices_y]) <= incerteza
+    ocupadas = proximos_y[:, :, None] & proximos_x[:, None, :]
+    pontos, candidato_y, candidato_x = np.nonzero(ocupadas)
+    return indices_y[pontos, candidato_y], indices_x[pontos, candidato_x], pontos
+
+
+def quadro_de_ocupacao(colunas, linhas, coordenadas):
+    """Distribui, em uma única passagem vetorizada, todos os pontos de um array de coordenadas (P, 2) nas células da
+    grade de impressão, retornando uma matriz booleana (linhas, colunas) das células próximas de algum ponto."""
+    quadro = np.zeros((len(linhas), len(colunas)), dtype=bool)
+    coordenadas = np.asarray(coordenadas, dtype=float)
+    coordenadas = coordenadas.reshape(-1, coordenadas.shape[-1] if coordenadas.ndim > 1 else 2)
+    if not quadro.size or not len(coordenadas):
+        return quadro
+    indices_y, indices_x, _ = celulas_dos_pontos(colunas, linhas, coordenadas)
+    quadro[indices_y, indices_x] = True
+    return quadro
+
+
+def quadro_de_profundidade(colunas, linhas, coordenadas):
+    """Versão com teste de profundidade de 'quadro_de_ocupacao': a partir de um array (P, 3) de pontos (x, y,
+    profundidade), retorna uma matriz (linhas, colunas) com a menor profundidade, isto é, a do ponto mais próximo do
+    observador, entre os pontos próximos de cada célula, ou infinito nas células vazias."""
+    quadro = np.full((len(linhas), len(colunas)), np.inf)
+    coordenadas = np.asarray(coordenadas, dtype=float).reshape(-1, 3)
+    if not quadro.size or not len(coordenadas):
+        return quadro
+    indices_y, indices_x, pontos = celulas_dos_pontos(colunas, linhas, coordenadas)
+    np.minimum.at(quadro, (indices_y, indices_x), coordenadas[pontos, 2])
+    return quadro
+
+
+def string_do_quadro(colunas, linhas, quadro, rampa="*", eixo=0):
+    """A partir de uma matriz de ocupação ou de profundidades da grade de impressão, retorna a string do gráfico, com
+    o valor de 'y' à esquerda de cada linha e o eixo 'z'' nas células vazias próximas de x = 'eixo'."""
+    fundo = np.where(np.abs(colunas - eixo) < .5, ord("|"), ord(" ")).astype(np.uint8)
+    codigos = np.frombuffer(rampa.encode("ascii"), dtype=np.uint8)
+    if quadro.dtype == bool:
+        caracteres = np.where(quadro, codigos[0], fundo)
+    else:
+        niveis = np.clip(np.nan_to_num(quadro) * len(codigos), 0, len(codigos) - 1).astype(np.int64)
+        caracteres = np.where(np.isnan(quadro), fundo, codigos[niveis])
+    string_total = "\n"
+    for y, linha in zip(linhas, caracteres):
+        string_linha = str(y) + " " * (6 - len(str(y)))
+        string_total += string_linha + linha.tobytes().decode() + "\n"
+    return string_total
+
+
+def profundidades_normalizadas(profundidades, raio):
+    """Converte profundidades de uma cena contida em uma esfera de raio 'raio' em valores entre 0 (mais próximo do
+    observador) e 1 (mais distante), mantendo infinito (células vazias) como NaN. Como o raio não depende da rotação, um
+    mesmo ponto mantém o seu tom ao girar a cena."""
+    with np.errstate(invalid="ignore"):
+        normalizadas = (profundidades + raio) / (2 * raio) if raio else profundidades * 0
+    return np.where(np.isinf(profundidades), np.nan, np.clip(normalizadas, 0, 1))
+
+
+def eixo_da_projecao(zoom=1, deslocamento=(0, 0)):
+    """Retorna o valor de 'x', no plano exibido, do eixo 'z'', que acompanha o deslocamento e a ampliação da
+    projeção."""
+    return -deslocamento[0] * zoom
+
+
+def janela_em_pixels(x_min, x_max, y_min, y_max, largura, altura):
+    """Retorna a escala, em pixels por unidade, e o centro da transformação que amplia a janela [x_min, x_max] x
+    [y_min, y_max] do plano de projeção, sem distorção, até o maior tamanho em que cabe inteira em uma imagem de
+    'largura' por 'altura' pixels, centralizada nela."""
+    escala = min(largura / (x_max - x_min), altura / (y_max - y_min))
+    centro = np.array(((x_min + x_max) / 2, (y_min + y_max) / 2))
+    return escala, centro
+
+
+def pixels_dos_pontos(pontos, escala, centro, largura, altura):
+    """Converte pontos do plano de projeção em coordenadas de pixels de uma imagem de 'largura' por 'altura' pixels,
+    segundo a transformação dada por 'janela_em_pixels'. O eixo vertical é invertido, pois a primeira linha da imagem é
+    a de maior 'y', e componentes além das duas primeiras, como a profundidade, são mantidas."""
+    pixels = np.array(pontos, dtype=float)
+    pixels[..., :2] = (pixels[..., :2] - centro) * (escala, -escala) + (largura / 2, altura / 2)
+    return pixels
+
+
+def string_da_cena(cena, rotacao_1, rotacao_2, profundidade=False, perfil=None, zoom=1, deslocamento=(0, 0)):
+    """Retorna a string do gráfico de uma cena, com os ângulos do plano de projeção dados em múltiplos de pi e a
+    projeção ampliada 'zoom' vezes em torno do ponto 'deslocamento'. Com 'profundidade', as células mais próximas do
+    observador recebem caracteres mais densos."""
+    inicio = perf_counter()
+    extremidades = projecao_da_cena(cena, pi * rotacao_1, pi * rotacao_2, profundidade)
+    if zoom != 1 or any(deslocamento):
+        extremidades[..., :2] = (extremidades[..., :2] - deslocamento) * zoom
+    projetado = perf_counter()
+    colunas, linhas = grade_de_impressao(*cena["limites"])
+    # Janela de recorte, com a margem de meia unidade em que um ponto ainda ocupa as células da borda:
+    visiveis = recortar_segmentos(extremidades, colunas[0] - .5, colunas[-1] + .5, linhas[-1] - .5, linhas[0] + .5)
+    recortado = perf_counter()
+    coordenadas = coordenadas_rasterizadas_dos_segmentos(visiveis, .5, 1)
+    amostrado = perf_counter()
+    if not profundidade:
+        quadro, rampa = quadro_de_ocupacao(colunas, linhas, coordenadas), "*"
+    else:
+        quadro = profundidades_normalizadas(quadro_de_profundidade(colunas, linhas, coordenadas), raio_da_cena(cena))
+        rampa = RAMPA_DE_PROFUNDIDADE
+    rasterizado = perf_counter()
+    string_total = string_do_quadro(colunas, linhas, quadro, rampa, eixo_da_projecao(zoom, deslocamento))
+    if perfil is not None:
+        perfil.registrar_sequencia((inicio, projetado, recortado, amostrado, rasterizado, perf_counter()))
+        perfil.contar(segmentos=len(extremidades), visiveis=len(visiveis), pontos=len(coordenadas))
+    return string_total
+
+
+def rasterizar_imagem(segmentos, x_min, x_max, y_min, y_max, largura, altura, suavizar=False, raio=None):
+    """Rasteriza um array (N, 2, 2) de segmentos projetados em uma imagem em tons de cinza, retornando um array
+    (altura, largura) de uint8, com fundo branco e segmentos pretos, ou cinzas, para segmentos (N, 2, 3) com
+    profundidade."""
+    segmentos = np.asarray(segmentos, dtype=float)
+    segmentos = segmentos.reshape(-1, 2, segmentos.shape[-1] if segmentos.ndim == 3 else 2)
+    escala, centro = janela_em_pixels(x_min, x_max, y_min, y_max, largura, altura)
+    pixels = pixels_dos_pontos(segmentos, escala, centro, largura, altura)
+    pontos = coordenadas_rasterizadas_dos_segmentos(recortar_segmentos(pixels, -1, largura + 1, -1, altura + 1), 1, 1)
+    if suavizar:
+        deslocamentos = ((0, 0), (1, 0), (0, 1), (1, 1))
+        posicoes = pontos[:, :2] - .5
+        base = np.floor(posicoes)
+        fracao = posicoes - base
+        base = base.astype(np.int64)
+        colunas = [base[:, 0] + deslocamento_x for deslocamento_x, _ in deslocamentos]
+        linhas = [base[:, 1] + deslocamento_y for _, deslocamento_y in deslocamentos]
+        pesos = [np.abs(1 - deslocamento_x - fracao[:, 0]) * np.abs(1 - deslocamento_y - fracao[:, 1])
+                 for deslocamento_x, deslocamento_y in deslocamentos]
+    else:
+        colunas, linhas = np.floor(pontos[:, :2]).astype(np.int64).T
+        colunas, linhas, pesos = [colunas], [linhas], [np.ones(len(pontos))]
+    cobertura = np.zeros(altura * largura)
+    profundidade = np.full(altura * largura, np.inf)
+    for coluna, linha, peso in zip(colunas, linhas, pesos):
+        validos = (coluna >= 0) & (coluna < largura) & (linha >= 0) & (linha < altura)
+        indices = linha[validos] * largura + coluna[validos]
+        cobertura += np.bincount(indices, peso[validos], minlength=altura * largura)
+        if pontos.shape[1] > 2:
+            np.minimum.at(profundidade, indices[peso[validos] > 0], pontos[validos, 2][peso[validos] > 0])
+    cobertura = np.minimum(cobertura, 1)
+    if pontos.shape[1] > 2:
+        # Tom de cada pixel, de preto (mais próximo) a cinza-claro (mais distante):
+        if raio is None:
+            raio = np.abs(pontos[:, 2]).max(initial=0) or 1
+        tom = 200 * np.nan_to_num(profundidades_normalizadas(profundidade, raio))
+    else:
+        tom = 0
+    return np.round(255 - cobertura * (255 - tom)).reshape(altura, largura).astype(np.uint8)
+
+
+def string_da_cena_em_subcelulas(cena, rotacao_1, rotacao_2, colunas, linhas, modo="braille", perfil=None, zoom=1,
+                                 deslocamento=(0, 0)):
+    """Versão de 'string_da_cena' com vários subpixels por caractere (Braille ou metades de bloco, segundo 'modo'),
+    em um gráfico de 'colunas' caracteres por 'linhas' linhas."""
+    subpixels_x, subpixels_y = SUBCELULAS[modo]
+    largura, altura = colunas * subpixels_x, linhas * subpixels_y
+    escala, centro = janela_em_pixels(*cena["limites"], largura, altura)
+    inicio = perf_counter()
+    extremidades = projecao_da_cena(cena, pi * rotacao_1, pi * rotacao_2)
+    if zoom != 1 or any(deslocamento):
+        extremidades = (extremidades - deslocamento) * zoom
+    pixels = pixels_dos_pontos(extremidades, escala, centro, largura, altura)
+    projetado = perf_counter()
+    visiveis = recortar_segmentos(pixels, 0, largura, 0, altura)
+    recortado = perf_counter()
+    pontos = np.floor(coordenadas_rasterizadas_dos_segmentos(visiveis, 1, 1)).astype(np.int64)
+    amostrado = perf_counter()
+    pontos = pontos[(pontos[:, 0] < largura) & (pontos[:, 1] < altura)]
+    ocupados = np.zeros((altura, largura), dtype=bool)
+    ocupados[pontos[:, 1], pontos[:, 0]] = True
+    celulas = ocupados.reshape(linhas, subpixels_y, colunas, subpixels_x)
+    if modo == "braille":
+        codigos = 0x2800 + np.tensordot(celulas, PONTOS_BRAILLE, axes=((1, 3), (0, 1)))
+        codigos[codigos == 0x2800] = ord(" ")
+    else:
+        codigos = MEIOS_BLOCOS[celulas[:, 0, :, 0] + 2 * celulas[:, 1, :, 0]]
+    rasterizado = perf_counter()
+    coluna_eixo = int(np.floor(pixels_dos_pontos((eixo_da_projecao(zoom, deslocamento), 0), escala, centro, largura,
+                                                 altura)[0] / subpixels_x))
+    if 0 <= coluna_eixo < colunas:
+        vazias = codigos[:, coluna_eixo] == ord(" ")
+        codigos[vazias, coluna_eixo] = ord("|")
+    # Valor de 'y' no centro de cada linha de caracteres:
+    valores_y = centro[1] + (altura / 2 - (np.arange(linhas) + .5) * subpixels_y) / escala
+    string_total = "\n"
+    for y, linha in zip(valores_y, codigos.astype(np.uint32)):
+        string_total += "%-7.1f" % y + linha.tobytes().decode("utf-32-le") + "\n"
+    if perfil is not None:
+        perfil.registrar_sequencia((inicio, projetado, recortado, amostrado, rasterizado, perf_counter()))
+        perfil.contar(segmentos=len(extremidades), visiveis=len(visiveis), pontos=len(pontos))
+    return string_total
@@ -0,0 +1,198 @@
+import numpy as np
+from contextlib import contextmanager
+from os import close, environ, pipe, read, set_blocking, write
+from select import select
+from signal import getsignal, signal, SIGWINCH
+from shutil import get_terminal_size
+from sys import stdin, stdout
+from termios import tcgetattr, tcsetattr, TCSADRAIN
+from time import perf_counter
+from tty import setraw
+
+
+class Teclado:
+    """Gerenciador de contexto que mantém o terminal em modo bruto durante toda a sessão e lê de uma só vez todas as
+    teclas já digitadas, marcando 'redimensionado' quando o terminal muda de tamanho."""
+
+    def __init__(self, entrada=None):
+        self.entrada = stdin if entrada is None else entrada
+        self.configuracao = None
+        self.teclas = ""
+        self.redimensionado = False
+        self.sinal = None
+        self.tratador_anterior = None
+
+    def __enter__(self):
+        self.configuracao = tcgetattr(self.entrada.fileno())
+        setraw(self.entrada.fileno())
+        # Canal pelo qual o tratador do sinal acorda a espera por teclas, já que 'select' é retomado após o sinal:
+        self.sinal = pipe()
+        set_blocking(self.sinal[1], False)
+        self.tratador_anterior = getsignal(SIGWINCH)
+        signal(SIGWINCH, self._redimensionar)
+        return self
+
+    def __exit__(self, *excecao):
+        signal(SIGWINCH, self.tratador_anterior)
+        for descritor in self.sinal:
+            close(descritor)
+        self.sinal = None
+        tcsetattr(self.entrada.fileno(), TCSADRAIN, self.configuracao)
+
+    def _redimensionar(self, *_):
+        self.redimensionado = True
+        try:
+            write(self.sinal[1], b"\0")
+        except BlockingIOError:
+            pass
+
+    @contextmanager
+    def modo_normal(self):
+        """Restaura temporariamente o modo original do terminal, para a leitura de linhas inteiras com 'input()'."""
+        tcsetattr(self.entrada.fileno(), TCSADRAIN, self.configuracao)
+        try:
+            yield
+        finally:
+            setraw(self.entrada.fileno())
+
+    def pendentes(self, espera=0.):
+        """Retorna todas as teclas já digitadas, aguardando a primeira por até 'espera' segundos ou, se 'espera' for
+        None, indefinidamente. Retorna uma string vazia se nenhuma tecla for digitada no intervalo ou se o terminal
+        for redimensionado."""
+        fd = self.entrada.fileno()
+        descritores = [fd] if self.sinal is None else [fd, self.sinal[0]]
+        while True:
+            prontos = select(descritores, [], [], espera)[0]
+            if not prontos:
+                break
+            if self.sinal is not None and self.sinal[0] in prontos:
+                read(self.sinal[0], 1024)
+            if fd in prontos:
+                dados = read(fd, 1024)
+                if not dados:
+                    break
+                self.teclas += dados.decode(errors="ignore")
+            espera = 0
+        teclas, self.teclas = self.teclas, ""
+        return teclas
+
+    def aguardar(self, prazo=None, ocioso=None):
+        """Aguarda teclas até o instante 'prazo', medido por 'perf_counter()' (ou indefinidamente, se None), e retorna
+        todas as que forem digitadas. Enquanto nenhuma tecla é pressionada, 'ocioso()' é chamada repetidamente, até
+        retornar False."""
+        while ocioso is not None and (prazo is None or perf_counter() < prazo):
+            teclas = self.pendentes()
+            if teclas or self.redimensionado:
+                return teclas
+            if not ocioso():
+                break
+        return self.pendentes(None if prazo is None else max(prazo - perf_counter(), 0))
+
+    def tecla(self, ocioso=None):
+        """Aguarda e retorna uma única tecla, mantendo as demais já digitadas para as próximas leituras."""
+        teclas = self.aguardar(ocioso=ocioso)
+        self.teclas = teclas[1:] + self.teclas
+        return teclas[:1]
+
+
+def centralize_lines(string, centralize_vertically=True, page_width=None, page_height=None):
+    """Recebe uma string e retorna a lista de suas linhas, centralizadas horizontalmente (e, opcionalmente,
+    verticalmente) na página."""
+    lines_string = string.split("\n")
+    if page_width is None:
+        page_width = 135
+    if page_height is None:
+        page_height = 40
+    lines = []
+    if centralize_vertically:
+        lines += [""] * (max(int((page_height-len(lines_string))/2), 0) + 1)
+    for l in lines_string:
+        space = int((page_width - len(l)) / 2)
+        lines.append(space * " " + l)
+    return lines
+
+
+class Tela:
+    """Mantém o último quadro exibido no terminal e, a cada novo quadro, reescreve apenas as células alteradas, por meio
+    de sequências ANSI de posicionamento do cursor, em uma única escrita na saída."""
+
+    # Sequências ANSI utilizadas: limpeza da tela, posicionamento do cursor e limpeza até o fim da linha.
+    LIMPAR = "\x1b[H\x1b[2J"
+    POSICIONAR = "\x1b[%d;%dH"
+    LIMPAR_LINHA = "\x1b[K"
+    # Trechos alterados separados por menos caracteres que isso são reescritos juntos, pois reposicionar o cursor
+    # custaria mais bytes do que reescrever os caracteres inalterados entre eles.
+    LACUNA_MINIMA = 8
+
+    def __init__(self, saida=None, incremental=None, altura=None, largura=None):
+        self.saida = stdout if saida is None else saida
+        if incremental is None:
+            incremental = self.saida.isatty() and environ.get("TERM", "dumb") != "dumb"
+        self.incremental = incremental
+        self.altura = altura
+        self.largura = largura
+        self.quadro_anterior = None
+        self.bytes_ultimo_quadro = 0
+
+    def redesenhar(self):
+        """Descarta o quadro anterior, de modo que o próximo quadro seja desenhado por completo."""
+        self.quadro_anterior = None
+
+    def desenhar(self, linhas):
+        """Exibe uma lista de linhas como o novo quadro do terminal e retorna a quantidade de bytes escritos."""
+        linhas = list(linhas)
+        # Um quadro que não cabe no terminal rola a tela e invalida o posicionamento do cursor, de modo que ele e o
+        # quadro seguinte são desenhados por completo:
+        cabe = self._cabe(linhas)
+        if self.incremental and self.quadro_anterior is not None and cabe:
+            texto = self._diferencas(linhas)
+        else:
+            texto = self.LIMPAR + "\r\n".join(linhas)
+        self.saida.write(texto)
+        self.saida.flush()
+        self.quadro_anterior = linhas if cabe else None
+        self.bytes_ultimo_quadro = len(texto.encode())
+        return self.bytes_ultimo_quadro
+
+    def _cabe(self, linhas):
+        """Indica se as linhas dadas ocupam, sem quebras, no máximo a altura do terminal."""
+        tamanho = get_terminal_size()
+        altura = tamanho.lines if self.altura is None else self.altura
+        largura = tamanho.columns if self.largura is None else self.largura
+        return len(linhas) <= altura and all(len(linha) <= largura for linha in linhas)
+
+    def _diferencas(self, linhas):
+        """Retorna as sequências que transformam o quadro anterior no quadro dado, terminando com o cursor ao fim da
+        última linha, assim como no redesenho completo."""
+        anterior = self.quadro_anterior
+        partes = []
+        for numero in range(max(len(linhas), len(anterior))):
+            nova = linhas[numero] if numero < len(linhas) else ""
+            antiga = anterior[numero] if numero < len(anterior) else ""
+            if nova == antiga:
+                continue
+            fim = None
+            for inicio, fim in self._trechos_alterados(nova, antiga):
+                partes.append(self.POSICIONAR % (numero + 1, inicio + 1) + nova[inicio:fim])
+            if len(nova) < len(antiga):
+                if fim != len(nova):
+                    partes.append(self.POSICIONAR % (numero + 1, len(nova) + 1))
+                partes.append(self.LIMPAR_LINHA)
+        if partes:
+            partes.append(self.POSICIONAR % (max(len(linhas), 1), len(linhas[-1]) + 1 if linhas else 1))
+        return "".join(partes)
+
+    def _trechos_alterados(self, nova, antiga):
+        """Retorna os intervalos [início, fim) de caracteres da linha nova que diferem da linha antiga."""
+        codigos_novos = np.frombuffer(nova.encode("utf-32-le"), dtype=np.uint32)
+        codigos_antigos = np.frombuffer(antiga.encode("utf-32-le"), dtype=np.uint32)[:len(codigos_novos)]
+        diferentes = np.ones(len(codigos_novos), dtype=bool)
+        diferentes[:len(codigos_antigos)] = codigos_novos[:len(codigos_antigos)] != codigos_antigos
+        indices = np.flatnonzero(diferentes)
+        if not len(indices):
+            return []
+        quebras = np.flatnonzero(np.diff(indices) > self.LACUNA_MINIMA)
+        inicios = indices[np.r_[0, quebras + 1]]
+        fins = indices[np.r_[quebras, len(indices) - 1]] + 1
+        return list(zip(inicios.tolist(), fins.tolist()))
+
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from malhas import carregar_malha, carregar_ply
+
+TETRAEDRO = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+
+
+def cabecalho_ply(formato, elementos):
+    """Retorna o cabeçalho de um arquivo PLY com os elementos dados, cada um como (nome, quantidade, propriedades)."""
+    linhas = ["ply", "format %s 1.0" % formato]
+    for nome, quantidade, propriedades in elementos:
+        linhas.append("element %s %d" % (nome, quantidade))
+        linhas += ["property " + propriedade for propriedade in propriedades]
+    return ("\n".join(linhas + ["end_header"]) + "\n").encode("ascii")
+
+
+def vertices_do_tetraedro():
+    return np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], dtype="<f4")
+
+
+def test_ply_ascii_com_propriedades_adicionais_nas_faces(tmp_path):
+    caminho = tmp_path / "tetraedro.ply"
+    cabecalho = cabecalho_ply("ascii", [("vertex", 4, ["float x", "float y", "float z"]),
+                                        ("face", 4, ["uchar red", "list uchar int vertex_indices", "uchar flags"])])
+    vertices = "\n".join(" ".join(str(c) for c in v) for v in vertices_do_tetraedro())
+    faces = "\n".join("255 3 %d %d %d 0" % face for face in ((0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)))
+    caminho.write_bytes(cabecalho + (vertices + "\n" + faces + "\n").encode("ascii"))
+    vertices, arestas = carregar_ply(str(caminho))
+    assert vertices.shape == (4, 3)
+    assert arestas.tolist() == [list(aresta) for aresta in TETRAEDRO]
+
+
+def test_ply_binario_com_propriedades_adicionais_nas_faces(tmp_path):
+    caminho = tmp_path / "tetraedro.ply"
+    cabecalho = cabecalho_ply("binary_little_endian", [("vertex", 4, ["float x", "float y", "float z"]),
+                                                       ("face", 4, ["list uchar int vertex_indices", "uchar flags"])])
+    faces = np.zeros(4, dtype=[("contagem", "u1"), ("indices", "<i4", (3,)), ("flags", "u1")])
+    faces["contagem"] = 3
+    faces["indices"] = [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)]
+    caminho.write_bytes(cabecalho + vertices_do_tetraedro().tobytes() + faces.tobytes())
+    assert carregar_ply(str(caminho))[1].tolist() == [list(aresta) for aresta in TETRAEDRO]
+
+
+def test_ply_binario_sem_faces_com_arestas(tmp_path):
+    caminho = tmp_path / "arestas.ply"
+    cabecalho = cabecalho_ply("binary_little_endian", [("vertex", 4, ["float x", "float y", "float z"]),
+                                                       ("face", 0, ["list uchar int vertex_indices"]),
+                                                       ("edge", 2, ["int vertex1", "int vertex2"])])
+    arestas = np.array([(0, 1), (2, 3)], dtype="<i4")
+    caminho.write_bytes(cabecalho + vertices_do_tetraedro().tobytes() + arestas.tobytes())
+    assert carregar_ply(str(caminho))[1].tolist() == [[0, 1], [2, 3]]
+
+
+@pytest.mark.parametrize("conteudo", ["3 0 1 2\n3 0 1", "3 0 1 2\n"])
+def test_ply_ascii_incompleto(tmp_path, conteudo):
+    caminho = tmp_path / "incompleto.ply"
+    cabecalho = cabecalho_ply("ascii", [("vertex", 4, ["float x", "float y", "float z"]),
+                                        ("face", 2, ["list uchar int vertex_indices"])])
+    vertices = "\n".join(" ".join(str(c) for c in v) for v in vertices_do_tetraedro())
+    caminho.write_bytes(cabecalho + (vertices + "\n" + conteudo).encode("ascii"))
+    with pytest.raises(ValueError, match="incompleto"):
+        carregar_ply(str(caminho))
+
+
+@pytest.mark.parametrize("propriedades, mensagem", [
+    (["float x", "float y", "half z"], "não suportado"),
+    (["float x", "float y"], "coordenadas"),
+])
+def test_ply_invalido(tmp_path, propriedades, mensagem):
+    caminho = tmp_path / "invalido.ply"
+    cabecalho = cabecalho_ply("ascii", [("vertex", 1, propriedades), ("face", 0, ["list uchar int vertex_indices"])])
+    caminho.write_bytes(cabecalho + b"0 0 0\n")
+    with pytest.raises(ValueError, match=mensagem):
+        carregar_ply(str(caminho))
+
+
+def test_malha_com_indices_inexistentes(tmp_path):
+    caminho = tmp_path / "invalido.obj"
+    caminho.write_text("v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 5\n")
+    with pytest.raises(ValueError, match="inexistentes"):
+        carregar_malha(str(caminho))